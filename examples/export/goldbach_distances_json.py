@@ -27,12 +27,7 @@ def export_goldbach_distances_json(start, end, output_file=None):
     """
     # Generate Goldbach distances
     gp = GoldbachPairs()
-    gp.ensure_sieve(end + 50)  # Extra buffer for distance calculations
-    distances = []
-
-    for n in range(start, end + 1):
-        distance = gp.goldbach_distance(n)
-        distances.append(distance)
+    distances = gp.goldbach_distances(start, end).tolist()
 
     # Create JSON data structure
     data = {
@@ -28,6 +28,14 @@ def main():
     parser.add_argument(
         "--end", type=int, default=5000, help="End of the range (default: 5000)"
     )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file; an interrupted search resumes from it when run again",
+    )
+    parser.add_argument(
+        "--snapshot",
+        help="Sieve snapshot file, so a resumed search does not have to sieve again",
+    )
 
     args = parser.parse_args()
 
@@ -45,18 +53,29 @@ def main():
     print(f"Searching range [{args.start}, {args.end}]...")
     print()
 
-    goldbach_pairs = GoldbachPairs()
+    goldbach_pairs = GoldbachPairs(snapshot=args.snapshot)
 
-    # Progress indicator for large ranges
-    progress_step = max(1, (args.end - args.start) // 20)
-    isolated_found = 0
+    if args.checkpoint:
+        # Checkpoint (and report progress) every twentieth of the range
+        progress_step = max(1, (args.end - args.start) // 20)
+
+        def report(n, hits):
+            print(f"  checked up to {n:,}, isolated numbers so far: {len(hits)}")
+
+        isolated = goldbach_pairs.get_isolated_goldbach_numbers(
+            args.start,
+            args.end,
+            checkpoint=args.checkpoint,
+            chunk_size=progress_step,
+            progress=report,
+        )
+    else:
+        isolated = goldbach_pairs.get_isolated_goldbach_numbers(args.start, args.end)
+    isolated_found = len(isolated)
 
-    for n in range(args.start, args.end + 1, 2):
-       
-        if goldbach_pairs.is_isolated_goldbach_number(n):
-            isolated_found += 1
-            pairs = goldbach_pairs.get(n)
-            print(f"ISOLATED NUMBER FOUND: {n} with pairs: {pairs}")
+    for n in isolated:
+        pairs = goldbach_pairs.get(n)
+        print(f"ISOLATED NUMBER FOUND: {n} with pairs: {pairs}")
 
     total_evens = len(range(args.start, args.end + 1, 2))
 
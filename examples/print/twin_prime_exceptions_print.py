@@ -16,6 +16,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from goldbach.goldbach_pairs import GoldbachPairs
 
 
+def has_no_twin_prime_pair(goldbach_pairs, n):
+    """find_first predicate: n is not the sum of two twin primes."""
+    return goldbach_pairs.count_twin_prime_goldbach_pairs(n) == 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Find even numbers with no twin prime Goldbach pairs"
@@ -26,6 +31,14 @@ def main():
     parser.add_argument(
         "--end", type=int, default=5000, help="End of the range (default: 5000)"
     )
+    parser.add_argument(
+        "--first",
+        action="store_true",
+        help="Only search for the first exception in the range",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes for --first (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -36,6 +49,16 @@ def main():
 
     goldbach_pairs = GoldbachPairs()
 
+    if args.first:
+        first = goldbach_pairs.find_first(
+            has_no_twin_prime_pair, args.start, args.end, workers=args.workers
+        )
+        if first is None:
+            print(f"No twin prime Goldbach exception in [{args.start}, {args.end}]")
+        else:
+            print(f"First twin prime Goldbach exception in [{args.start}, {args.end}]: {first}")
+        return
+
     # Find all exceptions
     exceptions = []
     total_checked = 0
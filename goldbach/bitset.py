@@ -0,0 +1,80 @@
+"""
+Count-only Goldbach queries on packed bitsets.
+
+Bit i of every mask stands for the odd number 2i + 1. For n = 2m, odd
+primes p = 2i + 1 and q = 2j + 1 pair up exactly when i + j = m - 1, so
+the partner of bit i is bit m - 1 - i. Keeping a bit-reversed copy of each
+mask turns "is the partner set?" into a single shift, and every count
+becomes AND + popcount over machine words.
+
+The masks are Python ints and counts use int.bit_count. Every operand is
+cut down to the m bits a query needs before combining, so the cost of a
+count grows with n, not with how far the sieve extends.
+
+and_bytes, or_bytes and xor_bytes combine equally long byte strings (such
+as wheel segments or one-byte-per-number indicators) the same way, through
+one big-int operation each.
+"""
+
+# Translation table turning a one-byte-per-number 0/1 indicator into the
+# ASCII digits int(..., 2) parses
+ASCII_BIT = bytes([48, 49]) + bytes(254)
+
+
+def and_bytes(a, b):
+    """Bytewise a & b of two equally long byte strings."""
+    return (int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def or_bytes(a, b):
+    """Bytewise a | b of two equally long byte strings."""
+    return (int.from_bytes(a, "little") | int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def xor_bytes(a, b):
+    """Bytewise a ^ b of two equally long byte strings."""
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+class PairCounter:
+    """
+    Prime, upper-twin, lower-twin and any-twin masks over a fixed number of
+    odd numbers, answering counts of Goldbach pairs of even n < 2 * width.
+    """
+
+    def __init__(self, indicator):
+        """indicator holds one byte per odd number: 1 if 2i + 1 is prime, else 0."""
+        self.width = len(indicator)
+        # int() of a '0'/'1' string reads the first character as the top bit,
+        # so the string in index order gives the bit-reversed mask for free
+        digits = bytes(indicator).translate(ASCII_BIT)
+        prime = int(digits[::-1], 2) if digits else 0
+        prime_rev = int(digits, 2) if digits else 0
+        upper, upper_rev = prime & (prime << 1), prime_rev & (prime_rev >> 1)
+        lower, lower_rev = prime & (prime >> 1), prime_rev & (prime_rev << 1)
+        self._masks = {
+            None: (prime, prime_rev),
+            "upper": (upper, upper_rev),
+            "lower": (lower, lower_rev),
+            "twin": (upper | lower, upper_rev | lower_rev),
+        }
+
+    def count(self, m, kind=None, both=False):
+        """
+        Count the pairs of odd primes p <= q with p + q = 2m (3 <= m < width).
+
+        kind restricts the count to pairs where p or q lies in the "upper",
+        "lower" or "twin" mask; with both=True p and q must both lie in it.
+        """
+        half = (m - 1) // 2  # p = 2i + 1 <= q for i <= half
+        shift = self.width - m
+        window = (1 << (half + 1)) - 1
+        prime, prime_rev = self._masks[None]
+        pairs = prime & (prime_rev >> shift) & window
+        if kind is None:
+            return pairs.bit_count()
+        mask, mask_rev = self._masks[kind]
+        if both:
+            return (mask & (mask_rev >> shift) & window).bit_count()
+        # AND before OR keeps every operand m bits wide instead of width bits
+        return ((pairs & mask) | (pairs & (mask_rev >> shift))).bit_count()
@@ -0,0 +1,72 @@
+"""
+Checkpoint files for long-running range searches.
+
+A checkpoint is a small JSON document recording which search it belongs to,
+the last even number that has been fully checked and how many hits had been
+found by then. The hits themselves go to an append-only log next to it
+(<path>.hits, little-endian int64), so a chunk only writes its own hits.
+The JSON is rewritten atomically after every chunk, once that chunk's hits
+are on disk; a search that is killed loses at most one chunk of work and
+resumes from the last completed one, dropping any hits logged after it.
+"""
+
+import json
+import os
+import sys
+from array import array
+
+_ITEMSIZE = 8
+_SWAP = sys.byteorder != "little"
+
+
+def _log_path(path):
+    return f"{path}.hits"
+
+
+def load_checkpoint(path, search, start):
+    """
+    Return (last_n, hits) stored at path for the given search and start,
+    or (None, []) if there is no checkpoint yet. The hit log is cut back to
+    the hits the checkpoint accounts for.
+    """
+    if not os.path.exists(path):
+        if os.path.exists(_log_path(path)):
+            os.remove(_log_path(path))  # hits of a chunk that never completed
+        return None, []
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("search") != search or state.get("start") != start:
+        raise ValueError(
+            f"{path} checkpoints the {state.get('search')!r} search from "
+            f"{state.get('start')}, not the {search!r} search from {start}"
+        )
+    count = state["hit_count"]
+    hits = array("q")
+    with open(_log_path(path), "a+b") as f:
+        f.truncate(count * _ITEMSIZE)
+        f.seek(0)
+        hits.frombytes(f.read())
+    if _SWAP:
+        hits.byteswap()
+    return state["last_n"], hits.tolist()
+
+
+def save_checkpoint(path, search, start, last_n, new_hits, hit_count):
+    """
+    Append new_hits to the hit log, then record the search state at path,
+    replacing any earlier checkpoint atomically. hit_count is the number of
+    hits so far, new_hits included.
+    """
+    values = array("q", new_hits)
+    if _SWAP:
+        values.byteswap()
+    with open(_log_path(path), "ab") as f:
+        f.write(values.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(
+            {"search": search, "start": start, "last_n": last_n, "hit_count": hit_count}, f
+        )
+    os.replace(tmp_path, path)
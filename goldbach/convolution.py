@@ -0,0 +1,58 @@
+"""
+Exact self-convolution of 0/1 indicator sequences.
+
+With NumPy the convolution is a real FFT rounded back to integers. Without
+it, the sequence is packed into one large decimal number (one fixed-width
+digit slot per entry) and squared; libmpdec multiplies huge numbers with a
+number-theoretic transform, so this stays subquadratic and exact.
+"""
+
+import decimal
+from array import array
+
+from .bitset import ASCII_BIT
+
+try:
+    import numpy as np
+except ImportError:  # fall back to exact big-number arithmetic
+    np = None
+
+
+def self_convolution(indicator, length):
+    """
+    Return c[0:length] with c[k] = sum(a[i] * a[k - i]) for the 0/1 sequence a.
+
+    The result is a NumPy int64 array when NumPy is installed and an
+    array('q') otherwise.
+    """
+    size = len(indicator)
+    if size == 0:
+        return np.zeros(length, dtype=np.int64) if np is not None else array("q", bytes(8 * length))
+
+    if np is not None:
+        a = np.frombuffer(bytes(indicator), dtype=np.uint8).astype(np.float64)
+        fft_size = 1 << (2 * size - 1).bit_length()
+        spectrum = np.fft.rfft(a, fft_size)
+        c = np.rint(np.fft.irfft(spectrum * spectrum, fft_size)[:length])
+        c = c.astype(np.int64)
+        if len(c) < length:
+            c = np.concatenate([c, np.zeros(length - len(c), dtype=np.int64)])
+        return c
+
+    # Every c[k] is at most size, so each slot needs that many digits
+    width = len(str(size))
+    digits = bytearray(b"0") * (width * size)
+    digits[width - 1 :: width] = bytes(indicator[::-1]).translate(ASCII_BIT)
+    context = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX)
+    x = context.create_decimal(digits.decode("ascii"))
+    square = str(context.multiply(x, x)).zfill(width * (2 * size))
+    total = len(square)
+    return array(
+        "q",
+        (
+            int(square[total - width * (k + 1) : total - width * k])
+            if k < 2 * size - 1
+            else 0
+            for k in range(length)
+        ),
+    )
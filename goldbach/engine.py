@@ -0,0 +1,334 @@
+"""
+Process-pool engine for per-n metrics over a range of even numbers.
+
+An Engine owned by a GoldbachPairs instance keeps a process pool and a
+shared memory copy of its wheel table alive across calls. The parent sieves
+far enough for the whole range and copies only the bytes the table gained
+since the last call; the block is reallocated with headroom when it runs
+out of room. Every task names the block and the table size, and each worker
+process attaches a GoldbachPairs instance to it, so the table exists once
+however many workers there are. Contiguous chunks of even numbers are
+handed out to the pool and each worker writes its int64 results straight
+into a shared result block at the chunk's offset; only chunk bounds and the
+metric name travel through pickling.
+
+find_first runs the same pool over growing windows of the range and stops
+at the lowest n satisfying a predicate. Hits are published through a shared
+bound, so workers drop chunks, or the rest of a chunk, above the lowest hit
+found so far.
+"""
+
+import threading
+import weakref
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+from .store import METRICS, compute_metric
+
+try:
+    import numpy as np
+except ImportError:  # results are returned as typed arrays
+    np = None
+
+# Integers the kernels read beyond the last n of a chunk (the frontier window
+# of goldbach_distances, the one-byte lag of the twin tables); exported along
+# with the range so that workers never have to grow the shared table.
+EXPORT_MARGIN = 1 << 10
+
+# Metrics whose range kernel only looks at the chunk itself (frontier searches)
+_CHUNK_LOCAL = ("lowest_prime", "min_gap", "max_gap", "goldbach_distance")
+
+# Metrics answered per n: the range kernels of these convolve the whole prefix
+_PER_N = {
+    "pair_count": lambda gp, n: gp.pair_count(n),
+    "upper_twin_pairs": lambda gp, n: gp.count_pairs_with_upper_twin_prime(n),
+    "lower_twin_pairs": lambda gp, n: gp.count_pairs_with_lower_twin_prime(n),
+    "any_twin_pairs": lambda gp, n: gp.count_pairs_with_any_twin_prime(n),
+    "twin_prime_pairs": lambda gp, n: gp.count_twin_prime_goldbach_pairs(n),
+    # 1 if n has no pair with an upper twin prime (bitset count) or with any
+    # twin prime (stops at the first one)
+    "critical": lambda gp, n: gp.is_critical_even_number(n),
+    "isolated": lambda gp, n: gp._first_twin_pair(n) is None,
+}
+
+_worker = None  # GoldbachPairs attached to the shared table in a worker process
+_table = None
+_table_size = 0
+
+
+def chunk_values(goldbach_pairs, metric, a, b):
+    """
+    Return the metric for every even n in [a, b] as a list of ints.
+
+    metric is a name from METRICS, "critical", "isolated", the name of a
+    per-n GoldbachPairs method, or a callable f(goldbach_pairs, n). Per-n
+    results of None become -1 and booleans become 0 or 1.
+    """
+    if metric in _CHUNK_LOCAL:
+        return compute_metric(goldbach_pairs, metric, a, b).tolist()
+    fn = _per_n_function(goldbach_pairs, metric)
+    values = []
+    for n in range(a, b + 1, 2):
+        value = fn(goldbach_pairs, n)
+        values.append(-1 if value is None else int(value))
+    return values
+
+
+def _per_n_function(goldbach_pairs, metric):
+    """Resolve a per-n metric (see chunk_values) to a callable f(goldbach_pairs, n)."""
+    if metric in _PER_N:
+        return _PER_N[metric]
+    if isinstance(metric, str):
+        if metric in METRICS or not hasattr(goldbach_pairs, metric):
+            raise ValueError(f"unknown metric {metric!r}")
+        method = getattr(goldbach_pairs, metric)
+        return lambda gp, n: method(n)
+    return metric
+
+
+def _attach(table_name, size, sieve_limit, oracle):
+    """Point this worker's GoldbachPairs at the first size bytes of the shared table."""
+    global _worker, _table, _table_size
+    if _worker is None:
+        from .goldbach_pairs import GoldbachPairs
+
+        _worker = GoldbachPairs(
+            snapshot=False, sieve_limit=sieve_limit, oracle=oracle, store=False
+        )
+    if _table is None or _table.name != table_name:
+        old, _table = _table, shared_memory.SharedMemory(name=table_name)
+        _worker._attach_table(_table.buf[:size])
+        if old is not None:
+            try:
+                old.close()
+            except BufferError:  # still referenced; unmapped once released
+                pass
+    elif size != _table_size:
+        _worker._attach_table(_table.buf[:size])
+    _table_size = size
+
+
+def _call(table, fn, *args):
+    _attach(*table)
+    return fn(*args)
+
+
+def _release(pool, table):
+    pool.shutdown(cancel_futures=True)
+    if table is not None:
+        table.close()
+        table.unlink()
+
+
+class Engine:
+    """
+    Process pool of `workers` processes sharing the wheel table of one
+    GoldbachPairs instance. Calls are serialized by a lock, since a table
+    export must not replace the block under tasks still using it.
+    """
+
+    def __init__(self, goldbach_pairs, workers):
+        self.goldbach_pairs = goldbach_pairs
+        self.workers = workers
+        self.lock = threading.Lock()
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._table = None
+        self._size = 0
+        self._finalizer = weakref.finalize(self, _release, self._pool, None)
+
+    def export(self, limit):
+        """Sieve up to limit and bring the shared table up to date."""
+        gp = self.goldbach_pairs
+        gp.reserve(limit)
+        flags = gp._flags
+        size = len(flags)
+        if self._table is None or size > self._table.size:
+            table = shared_memory.SharedMemory(create=True, size=max(size * 3 // 2, 1))
+            table.buf[:size] = flags
+            if self._table is not None:
+                self._table.close()
+                self._table.unlink()
+            self._table = table
+            self._finalizer.detach()
+            self._finalizer = weakref.finalize(self, _release, self._pool, table)
+        elif size > self._size:
+            self._table.buf[self._size : size] = flags[self._size : size]
+        self._size = size
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in a worker attached to the exported table."""
+        gp = self.goldbach_pairs
+        table = (self._table.name, self._size, gp.sieve_limit, gp.oracle)
+        return self._pool.submit(_call, table, fn, *args)
+
+    def close(self):
+        """Shut the pool down and free the shared table."""
+        self._finalizer()
+
+
+def _run_chunk(result_name, offset, metric, a, b):
+    values = array("q", chunk_values(_worker, metric, a, b))
+    result = shared_memory.SharedMemory(name=result_name)
+    try:
+        i = (a - offset) // 2 * values.itemsize
+        result.buf[i : i + len(values) * values.itemsize] = values.tobytes()
+    finally:
+        result.close()
+
+
+def map_range(goldbach_pairs, metric, start, end, workers, chunk, stop=None):
+    """
+    Evaluate metric (see chunk_values) for every even n in [start, end],
+    splitting the range into chunks of about chunk integers across
+    `workers` processes of the instance's Engine. With workers <= 1 the
+    chunks run in this process. If the threading.Event stop is set, the
+    chunks not yet finished are given up and None is returned.
+
+    Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+    """
+    start += start % 2
+    end -= end % 2
+    count = max((end - start) // 2 + 1, 0)
+    goldbach_pairs.reserve(end + 2)
+    step = max(2, chunk + chunk % 2)
+    bounds = [(a, min(a + step - 2, end)) for a in range(start, end + 1, step)]
+
+    if workers <= 1 or len(bounds) <= 1:
+        values = array("q")
+        for a, b in bounds:
+            if stop is not None and stop.is_set():
+                return None
+            values.extend(chunk_values(goldbach_pairs, metric, a, b))
+        return np.array(values, dtype=np.int64) if np is not None else values
+
+    engine = goldbach_pairs._engine_for(workers)
+    result = shared_memory.SharedMemory(create=True, size=max(8 * count, 1))
+    try:
+        with engine.lock:
+            engine.export(end + EXPORT_MARGIN)
+            futures = [
+                engine.submit(_run_chunk, result.name, start, metric, a, b) for a, b in bounds
+            ]
+            try:
+                for future in futures:
+                    if stop is not None and stop.is_set():
+                        return None
+                    future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+                wait(futures)  # no task may still write into the result block
+        data = bytes(result.buf[: 8 * count])
+    finally:
+        result.close()
+        result.unlink()
+    if np is not None:
+        return np.frombuffer(data, dtype=np.int64).copy()
+    values = array("q")
+    values.frombytes(data)
+    return values
+
+
+def _read_bound(bound):
+    return int.from_bytes(bound.buf[:8], "little")
+
+
+def _write_bound(bound, n):
+    bound.buf[:8] = n.to_bytes(8, "little")
+
+
+def _find_in_chunk(bound_name, predicate, a, b):
+    fn = _per_n_function(_worker, predicate)
+    bound = shared_memory.SharedMemory(name=bound_name)
+    try:
+        for n in range(a, b + 1, 2):
+            if n >= _read_bound(bound):  # a lower hit is already known
+                return None
+            if fn(_worker, n):
+                return n
+        return None
+    finally:
+        bound.close()
+
+
+def find_first(goldbach_pairs, predicate, start, end, workers, chunk):
+    """
+    Return the lowest even n in [start, end] for which predicate holds, or
+    None. predicate is "critical", "isolated", the name of a per-n
+    GoldbachPairs method or a picklable callable f(goldbach_pairs, n); a
+    truthy result is a hit.
+
+    The range is searched in windows that double in size, so the sieve only
+    grows as far as the search gets. Within a window, chunks of about chunk
+    integers go to `workers` processes; a hit is returned once every chunk
+    below it is done, and the remaining chunks are cancelled. With
+    workers <= 1 the search runs in this process.
+    """
+    start += start % 2
+    end -= end % 2
+    if workers <= 1:
+        fn = _per_n_function(goldbach_pairs, predicate)
+    step = max(2, chunk + chunk % 2)
+    span = step * max(workers, 1)
+    low = start
+    while low <= end:
+        high = min(low + span - 2, end)
+        goldbach_pairs.reserve(high + 2)
+        goldbach_pairs.prefetch(min(high + 2 * span, end) + 2)
+        if workers <= 1:
+            for n in range(low, high + 1, 2):
+                if fn(goldbach_pairs, n):
+                    return n
+        else:
+            bounds = [(a, min(a + step - 2, high)) for a in range(low, high + 1, step)]
+            hit = _find_in_window(goldbach_pairs, predicate, bounds, workers)
+            if hit is not None:
+                return hit
+        low = high + 2
+        span *= 2
+    return None
+
+
+def _find_in_window(goldbach_pairs, predicate, bounds, workers):
+    engine = goldbach_pairs._engine_for(workers)
+    bound = shared_memory.SharedMemory(create=True, size=8)
+    try:
+        lowest = bounds[-1][1] + 2  # lowest hit found so far
+        _write_bound(bound, lowest)
+        with engine.lock:
+            engine.export(lowest + EXPORT_MARGIN)
+            futures = []
+            confirmed = 0  # chunks below this index finished without a hit
+            try:
+                while True:
+                    # Keep the pool busy, but never start chunks above a known hit
+                    while (
+                        len(futures) < len(bounds)
+                        and len(futures) - confirmed < 2 * workers
+                        and bounds[len(futures)][0] < lowest
+                    ):
+                        a, b = bounds[len(futures)]
+                        futures.append(
+                            engine.submit(_find_in_chunk, bound.name, predicate, a, b)
+                        )
+                    if confirmed == len(futures):
+                        return None
+                    done, _ = wait(futures[confirmed:], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        hit = future.result()
+                        if hit is not None and hit < lowest:
+                            lowest = hit
+                            _write_bound(bound, lowest)
+                    while confirmed < len(futures) and futures[confirmed].done():
+                        hit = futures[confirmed].result()
+                        if hit is not None:
+                            return hit
+                        confirmed += 1
+            finally:
+                for future in futures:
+                    future.cancel()
+                wait(futures)  # running chunks see the bound and return early
+    finally:
+        bound.close()
+        bound.unlink()
@@ -2,17 +2,203 @@
 Goldbach Pairs: Efficiently computes all Goldbach pairs for even numbers in a range.
 """
 
+import asyncio
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import wraps
+from itertools import accumulate, chain, islice
+from math import isqrt
+from operator import sub
+
+from .bitset import ASCII_BIT, PairCounter, and_bytes, or_bytes, xor_bytes
+from .checkpoint import load_checkpoint, save_checkpoint
+from .convolution import self_convolution
+from .engine import Engine, chunk_values, find_first, map_range
+from .memo import LRUMemo
+from .parallel import parallel_sieve_chunks
+from .primality import miller_rabin
+from .topk import TopDistances
+from .twins import TwinTables
+from .snapshot import locked_snapshot, open_snapshot, save_snapshot
+from .store import MetricsStore, compute_metric
+from .wheel import WHEEL_MASK, odd_indicator, segment_primes, sieve_segment, unpack
+
+try:
+    import numpy as np
+except ImportError:  # range methods fall back to typed arrays
+    np = None
+else:
+    _WHEEL_MASK_NP = np.array(WHEEL_MASK, dtype=np.uint8)
+
+# Number of wheel bytes (30 integers each) sieved per segment when the sieve is extended.
+SEGMENT_SIZE = 1 << 18
+
+# Largest number the sieve is grown to just to answer a primality query.
+SIEVE_LIMIT = 10**8
+
+# Numbers resolved per block by goldbach_distances, bounding its working memory.
+DISTANCE_CHUNK = 1 << 20
+
+# Integers checked between two checkpoints of a resumable search.
+CHECKPOINT_CHUNK = 1 << 20
+
+# Integers per task handed to a worker by map_range.
+MAP_CHUNK = 1 << 16
+
+# Integers per chunk handed to a worker by find_first.
+FIND_CHUNK = 1 << 12
+
+# Integers per chunk computed by ascan.
+ASCAN_CHUNK = 1 << 14
+
+# Integers ascan computes between checks for cancellation.
+ASCAN_BLOCK = 1 << 7
+
+# Primes kept decoded for the early-exit twin-pair scan of the resumable searches.
+EARLY_EXIT_PRIMES = 1 << 16
+
+# Ranges with fewer even numbers than this are scanned per n in the critical
+# and isolated searches; wider ones use the range convolutions.
+RANGE_SCAN_THRESHOLD = 1024
+
+
+GoldbachMetrics = namedtuple(
+    "GoldbachMetrics",
+    "n pair_count lowest_prime min_gap max_gap mean_gap median_gap "
+    "upper_twin_pairs lower_twin_pairs any_twin_pairs twin_prime_pairs critical isolated",
+)
+
+
+def _memoized(method):
+    """
+    Serve a per-n method from the instance memo when memoization is on.
+    Results are keyed by method name and n; further arguments such as the
+    hint of goldbach_distance only steer the computation, not its result.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, n, *args, **kwargs):
+        if self._memo is None:
+            return method(self, n, *args, **kwargs)
+        return self._memo.lookup((name, n), lambda: method(self, n, *args, **kwargs))
+
+    return wrapper
+
+
+class PrimeSet:
+    """
+    Read-only, set-like view of the sieved primes.
+
+    Membership is answered from the packed wheel table of the owning
+    GoldbachPairs instance, so no Python int objects are kept per prime.
+    """
+
+    def __init__(self, goldbach_pairs):
+        self._goldbach_pairs = goldbach_pairs
+
+    def __contains__(self, n):
+        return self._goldbach_pairs._is_prime(n)
+
+    def __iter__(self):
+        return iter(self._goldbach_pairs.primes)
+
+    def __len__(self):
+        return len(self._goldbach_pairs.primes)
+
 
 class GoldbachPairs:
     """
     Main class for computing Goldbach pairs and related statistics.
     Sieve is built and expanded automatically as needed.
+
+    Primality is looked up in a mod-30 wheel table with 8 bits per 30
+    integers (see goldbach.wheel). The sorted primes are decoded from that
+    table into a typed array lazily, only as far as a query needs them.
+
+    If a snapshot path is given (or set in the GOLDBACH_SNAPSHOT environment
+    variable) the table is memory-mapped from that file and every extension
+    is appended to it, so later runs and concurrent processes reuse the sieve.
+    snapshot=False turns snapshots off regardless of the environment.
+
+    With workers > 1, large sieve extensions are split across a process pool
+    (see goldbach.parallel).
+
+    Primality of numbers above sieve_limit is answered by the oracle
+    (deterministic Miller-Rabin by default) instead of sieving up to them.
+
+    If a store directory is given (or set in the GOLDBACH_STORE environment
+    variable) the range metrics served by metric() are kept there as
+    memory-mapped columns (see goldbach.store) and computed only once;
+    store=False ignores the environment variable.
+
+    With thread_safe=True the instance can be shared between threads:
+    queries read the published tables without locking, and every extension
+    (sieve, decoded primes, twin tables, bitsets) is built on a private copy
+    under a single writer lock and then published by one attribute store,
+    so a published table is never modified in place. Without it, tables
+    grow in place, which is cheaper but only safe from one thread.
+
+    With prefetch=True, scans that walk upwards (get sweeps, chunked
+    distance and checkpointed searches) sieve the next segment in a
+    background process while the current one is analysed (see prefetch).
+
+    memo turns on memoization of get, get_array and the per-n results derived
+    from them: an int bounds the number of cached results, an LRUMemo allows
+    a byte bound as well (see goldbach.memo). It is off by default.
     """
 
-    def __init__(self):
-        self.max_n = 0
-        self.primes = []
-        self.primes_set = set()
+    def __init__(
+        self,
+        snapshot=None,
+        workers=1,
+        sieve_limit=SIEVE_LIMIT,
+        oracle=miller_rabin,
+        memo=None,
+        store=None,
+        thread_safe=False,
+        prefetch=False,
+    ):
+        if snapshot is None:
+            snapshot = os.environ.get("GOLDBACH_SNAPSHOT")
+        self.snapshot = snapshot or None
+        self.workers = workers
+        self.sieve_limit = sieve_limit
+        self.oracle = oracle
+        self.primes_set = PrimeSet(self)
+        self.thread_safe = thread_safe
+        # Serializes every change to the shared tables; readers never take it
+        self._write_lock = threading.RLock() if thread_safe else nullcontext()
+        self._prefetch = prefetch
+        self._executor = None
+        self._pending = None  # (low, high, future) of the segment sieved in the background
+        self._engine = None  # process pool over a shared copy of the table (see goldbach.engine)
+        self._primes = array("I")
+        self._decoded = 0  # wheel bytes already decoded into self._primes
+        self._pair_counter = None
+        self._attached = False  # the table is a fixed shared block (see _attach_table)
+        self._twins = TwinTables()
+        self._critical_prefix = None
+        self._memo = LRUMemo(maxsize=memo) if isinstance(memo, int) else memo
+        self._flags = open_snapshot(self.snapshot) if self.snapshot else bytearray()
+        self.max_n = max(0, 30 * len(self._flags) - 1)
+        if store is None:
+            store = os.environ.get("GOLDBACH_STORE")
+        self.store = MetricsStore(store, self) if store else None
+
+    def memo_info(self):
+        """Return the memo's hit/miss counters and usage as a MemoInfo, or None if memoization is off."""
+        return self._memo.info() if self._memo is not None else None
+
+    @property
+    def primes(self):
+        """Typed array of all primes <= max_n."""
+        return self._primes_upto(self.max_n)
 
     def sieve_primes(self, limit):
         """Return a list of all primes <= limit using Sieve of Eratosthenes."""
@@ -24,48 +210,636 @@ class GoldbachPairs:
         return [i for i, is_prime in enumerate(sieve) if is_prime]
 
     def ensure_sieve(self, upto):
-        """Ensure the sieve is computed up to the given limit."""
+        """
+        Ensure the sieve is computed up to the given limit.
+
+        Only the new interval (max_n, upto] is sieved. The limit is grown
+        geometrically so that callers walking upwards through n trigger a
+        logarithmic number of extensions instead of one per call.
+        """
         if upto > self.max_n:
-            self.primes = self.sieve_primes(upto)
-            self.primes_set = set(self.primes)
-            self.max_n = upto
+            self._extend_sieve(max(upto, self.max_n * 3 // 2))
+            self.prefetch(self.max_n * 3 // 2)  # the next geometric step
+
+    def save(self, path):
+        """Write the current sieve to a snapshot file that GoldbachPairs(snapshot=path) can map."""
+        save_snapshot(path, self._flags)
+
+    def reserve(self, limit):
+        """
+        Sieve up to limit in one pass.
+
+        Range methods call this up front so that a scan to N costs a single
+        sieve extension rather than one per even number.
+        """
+        if limit > self.max_n:
+            self._extend_sieve(limit)
+
+    def _extend_sieve(self, limit):
+        """
+        Sieve the interval (max_n, limit] segment by segment.
+        The table grows in whole wheel bytes, so max_n ends up as 30k - 1 >= limit.
+
+        Runs under the writer lock. The new table is published before max_n,
+        so a reader that checks max_n first always indexes a table at least
+        that large.
+        """
+        with self._write_lock:
+            if limit > self.max_n:
+                if self.thread_safe:
+                    # Every extension copies the table, so grow geometrically
+                    limit = max(limit, self.max_n * 3 // 2)
+                self._grow_table(limit)
+
+    def _grow_table(self, limit):
+        high = limit // 30 + 1
+        root = isqrt(30 * high - 1)
+        if root >= 7 and root > self.max_n:
+            # Base primes up to sqrt(limit) must be known before sieving the segment.
+            self._extend_sieve(root)
+        primes = self._primes_upto(root)
+        base_primes = primes[: bisect_right(primes, root)]
+
+        if self.snapshot:
+            with locked_snapshot(self.snapshot) as (f, low):
+                # The file may already be longer than our mapping if another process extended it
+                for chunk in self._new_chunks(base_primes, low, high):
+                    f.write(chunk)
+            self._flags = open_snapshot(self.snapshot)
+        else:
+            flags = self._flags
+            if self.thread_safe or not isinstance(flags, bytearray):
+                # Readers may hold the published table, and an attached shared
+                # table is read-only: grow a private copy
+                flags = bytearray(flags)
+            for chunk in self._new_chunks(base_primes, len(flags), high):
+                flags += chunk
+            self._flags = flags
+        self.max_n = max(self.max_n, 30 * len(self._flags) - 1)
+
+    def _attach_table(self, flags):
+        """Use an existing wheel table, e.g. one in shared memory, instead of sieving."""
+        self._attached = True
+        self._flags = flags
+        self.max_n = max(0, 30 * len(flags) - 1)
+
+    def prefetch(self, limit):
+        """
+        Start sieving the table up to limit in a background process, if the
+        instance was created with prefetch=True.
+
+        Scans call this for chunk k + 1 before they analyse chunk k; by the
+        time they extend the sieve, the segment is usually ready and is only
+        appended. One segment is in flight at a time (double buffering), and
+        nothing is started before the base primes up to sqrt(limit) are known.
+        """
+        if not self._prefetch or limit <= self.max_n or self._pending is not None:
+            return
+        with self._write_lock:
+            low = len(self._flags)
+            high = limit // 30 + 1
+            root = isqrt(30 * high - 1)
+            if self._pending is not None or low >= high or root > self.max_n:
+                return
+            primes = self._primes_upto(root)
+            base_primes = primes[: bisect_right(primes, root)]
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=1)
+            future = self._executor.submit(sieve_segment, base_primes, low, high)
+            self._pending = (low, high, future)
+
+    def close(self):
+        """Stop the background prefetch process and the map_range pool, if started."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+            self._pending = None
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
 
+    def _engine_for(self, workers):
+        """Return the Engine with the given number of workers, replacing one of another size."""
+        with self._write_lock:
+            engine = self._engine
+            if engine is None or engine.workers != workers:
+                if engine is not None:
+                    engine.close()
+                engine = self._engine = Engine(self, workers)
+        return engine
+
+    def _new_chunks(self, base_primes, low, high):
+        """
+        Yield the wheel bytes of [low, high), starting with the prefetched
+        segment if it begins at low. The table may end up beyond high.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            if pending[0] == low:
+                yield pending[2].result()
+                low = pending[1]
+            else:
+                pending[2].cancel()  # the table has moved on without it
+        yield from self._sieve_chunks(base_primes, low, high)
+
+    def _sieve_chunks(self, base_primes, low, high):
+        """Yield the packed wheel bytes of [low, high) in order, in parallel if worthwhile."""
+        if self.workers > 1 and high - low > 2 * SEGMENT_SIZE:
+            yield from parallel_sieve_chunks(
+                base_primes, low, high, self.workers, SEGMENT_SIZE
+            )
+            return
+        while low < high:
+            top = min(low + SEGMENT_SIZE, high)
+            yield sieve_segment(base_primes, low, top)
+            low = top
+
+    def _primes_upto(self, bound):
+        """Return self._primes after decoding the table far enough to hold every prime <= bound."""
+        high = min(bound // 30 + 1, len(self._flags))
+        if self._decoded >= high:
+            return self._primes
+        with self._write_lock:
+            primes = self._primes
+            if self.thread_safe:
+                # Published arrays stay untouched, so decode ahead to amortize the copy
+                primes = array(primes.typecode, primes)
+                high = min(max(high, 2 * self._decoded), len(self._flags))
+            if not primes:
+                primes.extend((2, 3, 5))
+            if 30 * high > 1 << 32 and primes.typecode == "I":
+                primes = array("Q", primes)
+            decoded = self._decoded
+            while decoded < high:
+                top = min(decoded + SEGMENT_SIZE, high)
+                primes.extend(segment_primes(bytes(self._flags[decoded:top]), decoded))
+                decoded = top
+            self._primes = primes
+            self._decoded = max(self._decoded, decoded)
+        return self._primes
+
+    def _is_prime(self, n):
+        """Look n up in the wheel table. Numbers beyond max_n are reported as not prime."""
+        if n < 7:
+            return n in (2, 3, 5) and n <= self.max_n
+        return n <= self.max_n and self._flags[n // 30] & WHEEL_MASK[n % 30] != 0
+
+    def is_prime(self, n):
+        """
+        Return True if n is prime.
+        Looked up in the sieve up to sieve_limit (extending it if needed), answered by the oracle above it.
+        """
+        if n > self.max_n:
+            if n > self.sieve_limit:
+                return self.oracle(n)
+            self.ensure_sieve(n)
+        return self._is_prime(n)
+
+    def iter_primes(self, start, stop, segment_size=30 * SEGMENT_SIZE):
+        """
+        Yield the primes p with start <= p < stop in increasing order.
+        See iter_prime_chunks for how memory is bounded.
+        """
+        return chain.from_iterable(self.iter_prime_chunks(start, stop, segment_size))
+
+    def iter_prime_chunks(self, start, stop, segment_size=30 * SEGMENT_SIZE):
+        """
+        Yield the primes in [start, stop) as typed arrays, one segment of about
+        segment_size integers at a time.
+
+        Segments inside the sieve are decoded from the wheel table; segments
+        beyond max_n are sieved on the fly and discarded after use, so walking
+        a window costs memory bounded by segment_size rather than by stop.
+        """
+        start = max(start, 2)
+        if start >= stop:
+            return
+        typecode = "I" if stop <= 1 << 32 else "Q"
+        small = [p for p in (2, 3, 5) if start <= p < stop]
+        if small:
+            yield array(typecode, small)
+
+        root = isqrt(stop - 1)
+        self.ensure_sieve(root)
+        primes = self._primes_upto(root)
+        base_primes = primes[: bisect_right(primes, root)]
+
+        step = max(1, segment_size // 30)
+        lo = start // 30
+        end = (stop - 1) // 30 + 1
+        while lo < end:
+            # Do not let a segment straddle the end of the table
+            table_end = len(self._flags)
+            hi = min(lo + step, end, table_end) if lo < table_end else min(lo + step, end)
+            if hi <= table_end:
+                segment = bytes(self._flags[lo:hi])
+            else:
+                segment = sieve_segment(base_primes, lo, hi)
+            chunk = segment_primes(segment, lo)
+            if 30 * lo < start or 30 * hi > stop:
+                chunk = chunk[bisect_left(chunk, start) : bisect_left(chunk, stop)]
+            if chunk:
+                yield array(typecode, chunk)
+            lo = hi
+
+    @_memoized
     def get(self, even_n):
         """Return all Goldbach pairs (p, q) with p <= q, p + q = even_n."""
         self.ensure_sieve(even_n)
-        pairs = []
-        for p in self.primes:  # already sorted
+        if even_n & 1:
+            # Only 2 can pair with an odd partner
+            return [(2, even_n - 2)] if self._is_prime(even_n - 2) and even_n >= 4 else []
+        if np is not None:
+            return [(p, even_n - p) for p in self.get_array(even_n).tolist()]
+        pairs = [(2, 2)] if even_n == 4 else []
+        flags = self._flags
+        for p in islice(self._primes_upto(even_n // 2), 1, None):  # already sorted, 2 handled above
             q = even_n - p
             if q < p:
                 break
-            if q in self.primes_set:
+            if flags[q // 30] & WHEEL_MASK[q % 30] if q >= 7 else q in (3, 5):
                 pairs.append((p, q))
         return pairs
 
+    @_memoized
+    def get_array(self, even_n):
+        """
+        Return the lower primes p of all Goldbach pairs (p, even_n - p) with p <= q as a
+        typed array in increasing order; q is implied.
+
+        With NumPy the candidates p <= even_n / 2 are gathered at once and the
+        wheel table is probed with a vectorized mask, so no tuples are built.
+        Returns a NumPy int64 array when NumPy is installed, a typed array otherwise.
+        """
+        self.ensure_sieve(even_n)
+        primes = self._primes_upto(even_n // 2)
+        k = bisect_right(primes, even_n // 2)
+
+        if np is not None:
+            dtype = np.uint32 if primes.typecode == "I" else np.uint64
+            lower = np.frombuffer(primes, dtype=dtype, count=k).astype(np.int64)
+            q = even_n - lower
+            hit = (q == 2) | (q == 3) | (q == 5)
+            wheel = q >= 7
+            qw = q[wheel]
+            flags = np.frombuffer(self._flags, dtype=np.uint8)
+            hit[wheel] = flags[qw // 30] & _WHEEL_MASK_NP[qw % 30] != 0
+            return lower[hit]
+
+        flags = self._flags
+        return array(
+            primes.typecode,
+            [
+                p
+                for p in islice(primes, k)
+                if (
+                    flags[(even_n - p) // 30] & WHEEL_MASK[(even_n - p) % 30]
+                    if even_n - p >= 7
+                    else even_n - p in (2, 3, 5)
+                )
+            ],
+        )
+
+    def _odd_indicator(self, count):
+        """Return one byte per odd number 1, 3, ..., 2 * count - 1: 1 if prime, else 0."""
+        self.reserve(2 * count)
+        return odd_indicator(bytes(self._flags[: count // 15 + 1]))[:count]
+
+    def pair_counts(self, start, end):
+        """
+        Return the number of Goldbach pairs r(n) for every even n in [start, end].
+
+        All counts come from one self-convolution of the odd prime indicator
+        (see goldbach.convolution): odd primes p = 2i + 1 and q = 2j + 1 add up
+        to n = 2m exactly when i + j = m - 1. That ordered count is halved back
+        to pairs with p <= q, counting p = q = m once.
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        start += start % 2
+        end -= end % 2
+        counts = self._odd_pair_counts(self._odd_indicator(max(end // 2, 0)), start, end)
+        if start <= 4 <= end:
+            counts[(4 - start) // 2] = 1  # 4 = 2 + 2
+        return counts
+
+    @staticmethod
+    def _odd_pair_counts(indicator, start, end):
+        """
+        Count the pairs of odd numbers p <= q flagged in indicator (one byte
+        per odd number) with p + q = n, for every even n in [start, end].
+        indicator must cover the odd numbers below end.
+        """
+        half = max(end // 2, 0)
+        indicator = indicator[:half]
+        ordered = self_convolution(indicator, half)
+
+        if np is not None:
+            m = np.arange(start // 2, end // 2 + 1)
+            inner = m >= 3
+            counts = np.zeros(len(m), dtype=np.int64)
+            mi = m[inner]
+            squares = np.frombuffer(bytes(indicator), dtype=np.uint8)[mi // 2] * (mi & 1)
+            counts[inner] = (ordered[mi - 1] + squares) // 2
+            return counts
+
+        counts = array("q")
+        for n in range(start, end + 1, 2):
+            m = n // 2
+            if m < 3:
+                counts.append(0)
+            else:
+                counts.append((ordered[m - 1] + (indicator[m >> 1] if m & 1 else 0)) // 2)
+        return counts
+
+    def _twin_pair_counts(self, start, end, kind, both=False):
+        """
+        Range counterpart of PairCounter.count: for every even n in [start, end],
+        count the Goldbach pairs where p or q (both=True: p and q) lies in the
+        "upper", "lower" or "twin" mask.
+
+        Pairs with both primes in the mask are one self-convolution of the mask.
+        For "p or q", inclusion-exclusion leaves the odd-prime pair counts minus
+        the pairs drawn only from primes outside the mask: two convolutions.
+        The pair 2 + 2 never involves a twin prime.
+        """
+        start += start % 2
+        end -= end % 2
+        half = max(end // 2, 0)
+        # the lower-twin mask of the last odd number needs the one after it
+        primes = bytes(self._odd_indicator(half + 1))
+        above, below = primes[1:] + b"\0", b"\0" + primes[:-1]
+        if kind == "upper":
+            mask = and_bytes(primes, below)
+        elif kind == "lower":
+            mask = and_bytes(primes, above)
+        else:
+            mask = and_bytes(primes, or_bytes(below, above))
+        if both:
+            return self._odd_pair_counts(mask, start, end)
+        outside = xor_bytes(primes, mask)
+        all_pairs = self._odd_pair_counts(primes, start, end)
+        outside_pairs = self._odd_pair_counts(outside, start, end)
+        if np is not None:
+            return all_pairs - outside_pairs
+        return array("q", map(sub, all_pairs, outside_pairs))
+
+    def upper_twin_pair_counts(self, start, end):
+        """
+        Return count_pairs_with_upper_twin_prime(n) for every even n in [start, end]
+        from two convolutions instead of one query per n.
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        return self._twin_pair_counts(start, end, "upper")
+
+    def lower_twin_pair_counts(self, start, end):
+        """
+        Return count_pairs_with_lower_twin_prime(n) for every even n in [start, end].
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        return self._twin_pair_counts(start, end, "lower")
+
+    def any_twin_pair_counts(self, start, end):
+        """
+        Return count_pairs_with_any_twin_prime(n) for every even n in [start, end].
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        return self._twin_pair_counts(start, end, "twin")
+
+    def twin_prime_goldbach_pair_counts(self, start, end):
+        """
+        Return count_twin_prime_goldbach_pairs(n) for every even n in [start, end]
+        from a single self-convolution of the twin-prime mask.
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        return self._twin_pair_counts(start, end, "twin", both=True)
+
+    def _counter_for(self, even_n):
+        """
+        Return the bitset PairCounter for count-only queries on even_n, or None
+        if even_n is odd or too small for it (those go through get_array).
+        The masks are sized by the queries, not by the table: when even_n is
+        beyond them they are rebuilt at least twice as wide.
+        """
+        if even_n & 1 or even_n < 6:
+            return None
+        counter = self._pair_counter
+        if counter is None or counter.width <= even_n // 2:
+            with self._write_lock:
+                counter = self._pair_counter
+                if counter is None or counter.width <= even_n // 2:
+                    width = even_n // 2 + 1
+                    if counter is not None:
+                        width = max(width, 2 * counter.width)
+                    if self._attached:
+                        # Growing an attached table would copy it: stay inside it
+                        width = min(width, max(even_n // 2 + 1, self.max_n // 2))
+                    counter = PairCounter(self._odd_indicator(width))
+                    self._pair_counter = counter
+        return counter
+
+    @_memoized
+    def pair_count(self, even_n):
+        """Return the number of Goldbach pairs of even_n without enumerating them."""
+        counter = self._counter_for(even_n)
+        if counter is None:
+            return len(self.get_array(even_n))
+        return counter.count(even_n // 2)
+
+    @_memoized
+    def metrics(self, even_n):
+        """
+        Return every per-n statistic of even_n as a GoldbachMetrics record.
+
+        The pairs are enumerated once: count, lowest prime and the min, max,
+        mean and median gap all follow from the sorted lower primes, since
+        q - p = even_n - 2p. The twin counts are AND + popcount on the same
+        pair set (see count_pairs_with_upper_twin_prime), and the critical
+        and isolated flags follow from them. Gap fields are None when even_n
+        has no pair; mean_gap and median_gap are floats. The gap and extreme
+        pair methods read the sorted lower primes directly and leave the
+        twin counts alone.
+        """
+        lower = self.get_array(even_n)
+        count = len(lower)
+        upper_twin = self.count_pairs_with_upper_twin_prime(even_n)
+        any_twin = self.count_pairs_with_any_twin_prime(even_n)
+        record = GoldbachMetrics(
+            n=even_n,
+            pair_count=count,
+            lowest_prime=None,
+            min_gap=None,
+            max_gap=None,
+            mean_gap=None,
+            median_gap=None,
+            upper_twin_pairs=upper_twin,
+            lower_twin_pairs=self.count_pairs_with_lower_twin_prime(even_n),
+            any_twin_pairs=any_twin,
+            twin_prime_pairs=self.count_twin_prime_goldbach_pairs(even_n),
+            critical=upper_twin == 0,
+            isolated=any_twin == 0,
+        )
+        if not count:
+            return record
+        first = int(lower[0])
+        last = int(lower[-1])
+        total = int(lower.sum()) if np is not None else sum(lower)
+        middle = count // 2
+        if count % 2:
+            median_gap = float(even_n - 2 * int(lower[middle]))
+        else:
+            median_gap = float(even_n - (int(lower[middle - 1]) + int(lower[middle])))
+        return record._replace(
+            lowest_prime=first,
+            min_gap=even_n - 2 * last,
+            max_gap=even_n - 2 * first,
+            mean_gap=(count * even_n - 2 * total) / count,
+            median_gap=median_gap,
+        )
+
+    def metrics_range(self, start, end):
+        """Return the GoldbachMetrics record of every even n in [start, end]."""
+        self.reserve(end + 2)
+        return [self.metrics(n) for n in range(start + start % 2, end + 1, 2)]
+
+    @_memoized
     def prime_gaps(self, even_n):
         """
         For a given even number, return a sorted list of q - p for each Goldbach pair (p, q).
         """
         if even_n % 2 != 0 or even_n < 4:
             raise ValueError("Input must be an even number >= 4")
-        pairs = self.get(even_n)
-        gaps = sorted(q - p for p, q in pairs)
-        return gaps
+        # q - p = even_n - 2p shrinks as p grows
+        return [even_n - 2 * p for p in reversed(self.get_array(even_n).tolist())]
 
     def smallest_prime_gap(self, even_n):
         """
         For a given even number, return the smallest prime gap (q - p) among all Goldbach pairs.
         """
-        gaps = self.prime_gaps(even_n)
-        return gaps[0] if gaps else None
+        if even_n % 2 != 0 or even_n < 4:
+            raise ValueError("Input must be an even number >= 4")
+        lower = self.get_array(even_n)
+        return even_n - 2 * int(lower[-1]) if len(lower) else None
+
+    @_memoized
+    def goldbach_distance(self, n, hint=None):
+        """
+        Return the smallest d >= 0 such that n - d and n + d are both prime, or -1 if there is none.
 
-    def goldbach_distance(self, n):
-        spg = self.smallest_prime_gap(2 * n)
+        The search walks outward from n and stops at the first hit, stepping d by 2 so
+        that n - d stays odd. hint is an expected distance, typically the previous
+        answer in a sweep over n: the sieve is sized to n + 2 * hint up front so the
+        search does not stall on sieve growth. Every smaller d still has to be checked,
+        so the hint never changes the result.
+        """
+        if n < 2:
+            raise ValueError("Input must be a number >= 2")
+        # Past the sieve limit every probe goes to the primality oracle instead
+        in_table = 2 * n <= self.sieve_limit
+        is_prime = self._is_prime if in_table else self.is_prime
+        if in_table:
+            self.ensure_sieve(n + 2 * max(hint or 0, 0) + 2)
+        if is_prime(n):
+            return 0
+
+        d = 1 + n % 2
+        while n - d >= 3:
+            if in_table and n + d > self.max_n:
+                self.ensure_sieve(n + d)
+            if is_prime(n - d) and is_prime(n + d):
+                return d
+            d += 2
+        return -1
+
+    def goldbach_distances(self, start, end):
+        """
+        Return the Goldbach distance of every n in [start, end] (start >= 2).
 
-        if spg is None:
-            return -1
+        Distances are resolved as a frontier: all n start out open, and for
+        d = 0, 1, 2, ... every n that is still open with n - d and n + d prime
+        is closed with distance d. Each step is one shifted AND over the primality
+        of the window around the block, and the loop ends once nothing is open.
+        Blocks of DISTANCE_CHUNK numbers are resolved one after another.
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        if start < 2:
+            raise ValueError("Input must be a number >= 2")
+        blocks = []
+        for a in range(start, end + 1, DISTANCE_CHUNK):
+            b = min(a + DISTANCE_CHUNK - 1, end)
+            self.reserve(b + 64)
+            self.prefetch(min(b + DISTANCE_CHUNK, end) + 64)
+            blocks.append(self._distance_block(a, b))
+        if np is not None:
+            return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int64)
+        result = array("q")
+        for block in blocks:
+            result.extend(block)
+        return result
+
+    def _prime_indicator(self, lo, hi):
+        """Return one byte per integer of [lo, hi]: 1 if prime, else 0."""
+        self.reserve(hi)
+        first = lo // 30
+        flags = unpack(bytes(self._flags[first : hi // 30 + 1]), first)
+        return flags[lo - 30 * first : hi - 30 * first + 1]
+
+    def _distance_block(self, a, b):
+        """Frontier search for the Goldbach distances of [a, b], widening the prime window as d grows."""
+        margin = 64
+        d = 0
+        if np is not None:
+            distances = np.full(b - a + 1, -1, dtype=np.int64)
+            ns = np.arange(a, b + 1, dtype=np.int64)
+            # n - d must be odd, so even and odd n are open on alternating steps
+            open_n = [ns[ns % 2 == 0], ns[ns % 2 == 1]]
         else:
-            return spg // 2  # Use integer division since result is always an integer
+            distances = array("q", [-1]) * (b - a + 1)
+            open_bits = (1 << (b - a + 1)) - 1
+
+        while True:
+            lo = max(a - margin, 0)
+            window = self._prime_indicator(lo, b + margin)
+            if np is not None:
+                is_prime = np.frombuffer(bytes(window), dtype=np.uint8).astype(bool)
+            else:
+                # Bit k stands for lo + k
+                is_prime = int(bytes(window[::-1]).translate(ASCII_BIT), 2)
+
+            while d <= margin:
+                if np is not None:
+                    for parity in (0, 1) if d == 0 else ((d + 1) % 2,):
+                        n = open_n[parity]
+                        n = n[n - d >= 2]
+                        hit = is_prime[n - d - lo] & is_prime[n + d - lo]
+                        distances[n[hit] - a] = d
+                        open_n[parity] = n[~hit]
+                    if not (len(open_n[0]) or len(open_n[1])):
+                        return distances
+                else:
+                    shift = a - d - lo
+                    # A negative shift means n - d < 0 for the lowest n: shift in zeros
+                    lower = is_prime >> shift if shift >= 0 else is_prime << -shift
+                    hit = lower & (is_prime >> (a + d - lo)) & open_bits
+                    if hit:
+                        open_bits ^= hit
+                        bits = bin(hit)
+                        top = len(bits) - 1
+                        i = bits.find("1", 2)
+                        while i != -1:
+                            distances[top - i] = d
+                            i = bits.find("1", i + 1)
+                    if not open_bits:
+                        return distances
+                if d > b - 2:
+                    return distances  # n - d has dropped below 2 for every open n
+                d += 1
+            margin *= 2
 
     def top_goldbach_distances(self, start, end, top_n=10):
         """
@@ -79,86 +853,286 @@ class GoldbachPairs:
         Returns:
             List of tuples (n, distance) sorted by distance in descending order.
             If there are ties, all numbers with the same distance are included.
+
+        Distances are consumed chunk by chunk into a bounded TopDistances
+        (see goldbach.topk), so memory does not grow with the range.
         """
-        distances = []
+        top = TopDistances(top_n)
+        for a in range(start, end + 1, DISTANCE_CHUNK):
+            self.reserve(min(a + DISTANCE_CHUNK - 1, end) + 64)
+            self.prefetch(min(a + 2 * DISTANCE_CHUNK - 1, end) + 64)
+            top.update(a, self.goldbach_distances(a, min(a + DISTANCE_CHUNK - 1, end)))
+        return top.result()
 
-        for n in range(start, end + 1):
-            distance = self.goldbach_distance(n)
-            if distance >= 0:  # Only include valid distances
-                distances.append((n, distance))
+    def lowest_primes(self, start, end):
+        """
+        Return the lowest prime p of the Goldbach pairs of every even n in
+        [start, end], or -1 where n has no pair.
 
-        # Sort by distance (descending), then by n (ascending) for consistent ordering
-        distances.sort(key=lambda x: (-x[1], x[0]))
+        With NumPy this is a frontier like goldbach_distances: for p = 2, 3,
+        5, ... every still open n with n - p prime is closed with p, block by
+        block, until nothing is open. Lowest primes are small, so only a few
+        dozen steps are needed. Without NumPy each n walks the primes upwards.
 
-        if not distances:
-            return []
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        start += start % 2
+        end -= end % 2
+        if end < start:
+            return np.zeros(0, dtype=np.int64) if np is not None else array("q")
+        self.reserve(end)
+        primes = self._primes_upto(end // 2)
+        if np is None:
+            is_prime = self._is_prime
+            lowest = array("q")
+            for n in range(start, end + 1, 2):
+                p = next((p for p in primes if p > n // 2 or is_prime(n - p)), n)
+                lowest.append(p if p <= n // 2 else -1)
+            return lowest
+
+        blocks = []
+        for a in range(start, end + 1, 2 * DISTANCE_CHUNK):
+            b = min(a + 2 * DISTANCE_CHUNK - 2, end)
+            open_n = np.arange(a, b + 1, 2, dtype=np.int64)
+            lowest = np.full(len(open_n), -1, dtype=np.int64)
+            margin = 64
+            i = 0
+            while len(open_n) and i < len(primes):
+                lo = max(a - margin, 0)
+                window = np.frombuffer(bytes(self._prime_indicator(lo, b)), dtype=np.uint8)
+                while len(open_n) and i < len(primes) and primes[i] <= margin:
+                    p = primes[i]
+                    open_n = open_n[open_n >= 2 * p]
+                    hit = window[open_n - p - lo].astype(bool)
+                    lowest[(open_n[hit] - a) // 2] = p
+                    open_n = open_n[~hit]
+                    i += 1
+                margin *= 2
+            blocks.append(lowest)
+        return np.concatenate(blocks)
+
+    def smallest_prime_gaps(self, start, end):
+        """
+        Return smallest_prime_gap(n) for every even n in [start, end], or -1
+        where n has no pair.
+
+        The pair of 2m with the smallest gap is (m - d, m + d) for the
+        Goldbach distance d of m, so the gaps are twice the distances of
+        [start / 2, end / 2].
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        start += start % 2
+        end -= end % 2
+        low = start // 2
+        high = end // 2
+        below = max(min(2, high + 1) - low, 0)  # 0 and 2 have no pairs
+        distances = self.goldbach_distances(max(low, 2), high) if high >= 2 else []
+        if np is not None:
+            distances = np.asarray(distances, dtype=np.int64)
+            gaps = np.where(distances >= 0, 2 * distances, -1)
+            return np.concatenate([np.full(below, -1, dtype=np.int64), gaps])
+        gaps = array("q", [-1]) * below
+        gaps.extend(2 * d if d >= 0 else -1 for d in distances)
+        return gaps
+
+    def largest_prime_gaps(self, start, end):
+        """
+        Return largest_prime_gap(n) for every even n in [start, end], or -1
+        where n has no pair, from the lowest primes.
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        start += start % 2
+        lowest = self.lowest_primes(start, end)
+        if np is not None:
+            evens = np.arange(start, start + 2 * len(lowest), 2, dtype=np.int64)
+            return np.where(lowest >= 0, evens - 2 * lowest, -1)
+        return array(
+            "q",
+            (n - 2 * p if p >= 0 else -1 for n, p in zip(range(start, end + 1, 2), lowest)),
+        )
+
+    def map_range(self, metric, start, end, workers=None, chunk=MAP_CHUNK):
+        """
+        Evaluate a per-n metric for every even n in [start, end] on a process pool.
+
+        metric is a name from goldbach.store.METRICS, "critical" or "isolated"
+        (1 if n is one, else 0), the name of a per-n method such as
+        "smallest_prime_gap", or a picklable callable f(goldbach_pairs, n).
+        None results become -1. The sieve is extended once for the whole range
+        and shared with the workers through shared memory; chunks of about
+        chunk integers are distributed over workers processes (default:
+        self.workers) and gathered in order. The pool and the shared table are
+        kept for later calls until close() (see goldbach.engine).
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        if workers is None:
+            workers = self.workers
+        return map_range(self, metric, start, end, workers, chunk)
 
-        # Find the minimum distance among the top N entries
-        if len(distances) <= top_n:
-            return distances
+    def find_first(self, predicate, start, end, workers=None, chunk=FIND_CHUNK):
+        """
+        Return the lowest even n in [start, end] satisfying predicate, or None.
+
+        predicate is "critical" or "isolated", the name of a per-n method
+        (a truthy result is a hit) or a picklable callable f(goldbach_pairs, n),
+        for example a module-level function testing goldbach_distance(n) > D.
+        Chunks of about chunk integers are checked on workers processes
+        (default: self.workers) over windows that double in size; as soon as
+        the lowest hit is confirmed the remaining chunks are cancelled, and
+        workers abandon chunks above any hit found (see goldbach.engine).
+        """
+        if workers is None:
+            workers = self.workers
+        return find_first(self, predicate, start, end, workers, chunk)
+
+    async def ascan(self, start, end, metric=None, chunk=ASCAN_CHUNK, ahead=2, workers=None):
+        """
+        Asynchronously yield (n, value) for every even n in [start, end] in order.
+
+        value is the GoldbachMetrics record of n, or with metric given the
+        value map_range would compute for it. The work runs chunk by chunk
+        (about chunk integers each) on a background thread, so the event loop
+        stays responsive. With a metric and workers > 1 every chunk is split
+        evenly over the processes of the instance's map_range engine, which
+        is kept for the whole scan; GoldbachMetrics records are always built
+        on the thread. At most `ahead` chunks are computed ahead of the
+        consumer (backpressure). Closing the generator or cancelling the
+        consuming task returns at once: chunks that have not started are
+        dropped and a running chunk stops after its current block of
+        ASCAN_BLOCK integers, or its pieces already running in workers.
+        """
+        if workers is None:
+            workers = self.workers
+        loop = asyncio.get_running_loop()
+        start += start % 2
+        step = max(2, chunk + chunk % 2)
+        bounds = ((a, min(a + step - 2, end)) for a in range(start, end + 1, step))
+        executor = ThreadPoolExecutor(max_workers=1)  # one chunk touches the tables at a time
+        pending = deque()
+        stop = threading.Event()
+
+        def submit():
+            for a, b in islice(bounds, 1):
+                future = loop.run_in_executor(
+                    executor, self._scan_chunk, metric, a, b, workers, stop
+                )
+                pending.append((a, future))
 
-        # Include all entries that tie with the Nth highest distance
-        nth_distance = distances[top_n - 1][1]
-        result = []
+        try:
+            for _ in range(ahead):
+                submit()
+            while pending:
+                a, future = pending.popleft()
+                values = await future
+                submit()
+                for i, value in enumerate(values):
+                    yield a + 2 * i, value
+        finally:
+            stop.set()
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
 
-        for n, distance in distances:
-            if distance >= nth_distance:
-                result.append((n, distance))
+    def _scan_chunk(self, metric, a, b, workers, stop):
+        """Compute one chunk of ascan block by block, giving up once stop is set."""
+        if metric is not None and workers > 1:
+            per_worker = -(-(b - a + 2) // workers)  # one piece of the chunk per worker
+            values = map_range(self, metric, a, b, workers, per_worker, stop)
+            return None if values is None else values.tolist()
+        self.reserve(b + 2)
+        values = []
+        for lo in range(a, b + 1, ASCAN_BLOCK):
+            if stop.is_set():
+                return None
+            hi = min(lo + ASCAN_BLOCK - 2, b)
+            if metric is None:
+                values.extend(self.metrics_range(lo, hi))
             else:
-                break
+                values.extend(chunk_values(self, metric, lo, hi))
+        return values
 
-        return result
+    def metric(self, name, start, end):
+        """
+        Return the per-n metric name (see goldbach.store.METRICS) for every
+        even n in [start, end].
+
+        With a metrics store the values are computed once and later calls,
+        including ones over sub-ranges, slice the memory-mapped columns.
+
+        Returns a NumPy int64 array when NumPy is installed, array('q') otherwise.
+        """
+        if self.store is not None:
+            return self.store.column(name, start, end)
+        return compute_metric(self, name, start, end)
 
     def largest_prime_gap(self, even_n):
         """
         For a given even number, return the largest prime gap (q - p) among all Goldbach pairs.
         """
-        gaps = self.prime_gaps(even_n)
-        return gaps[-1] if gaps else None
+        if even_n % 2 != 0 or even_n < 4:
+            raise ValueError("Input must be an even number >= 4")
+        lower = self.get_array(even_n)
+        return even_n - 2 * int(lower[0]) if len(lower) else None
 
+    @_memoized
     def pair_with_smallest_lower_prime(self, even_n):
         """
         For a given even number, return the Goldbach pair (p, q) with the largest lower prime p.
         Returns None if no such pair exists.
         """
-        self.ensure_sieve(even_n)
-        pairs = self.get(even_n)
-        if not pairs:
+        if even_n > self.sieve_limit:
+            # Walk p upwards and stop at the first hit instead of enumerating every pair
+            for p in chain((2,), range(3, even_n // 2 + 1, 2)):
+                if self.is_prime(p) and self.is_prime(even_n - p):
+                    return (p, even_n - p)
             return None
-        return min(pairs, key=lambda pair: pair[0])
+        lower = self.get_array(even_n)
+        if not len(lower):
+            return None
+        p = int(lower[0])
+        return (p, even_n - p)
 
     def pair_with_largest_lower_prime(self, even_n):
         """
         For a given even number, return the Goldbach pair (p, q) with the largest lower prime p.
         Returns None if no such pair exists.
         """
-        self.ensure_sieve(even_n)
-        pairs = self.get(even_n)
-        if not pairs:
+        lower = self.get_array(even_n)
+        if not len(lower):
             return None
-        return max(pairs, key=lambda pair: pair[0])
+        p = int(lower[-1])
+        return (p, even_n - p)
 
+    @_memoized
     def count_pairs_with_upper_twin_prime(self, even_n):
         """
         For a given even number, return the count of Goldbach pairs (p, q) where either p or q is an upper twin prime (i.e., p and p-2 are prime, or q and q-2 are prime).
         """
-        self.ensure_sieve(even_n)
-        pairs = self.get(even_n)
+        counter = self._counter_for(even_n)
+        if counter is not None:
+            return counter.count(even_n // 2, "upper")
+        twins = self._twin_tables(even_n)
         count = 0
-        for p, q in pairs:
-            if (p - 2 in self.primes_set) or (q - 2 in self.primes_set):
+        for p in self.get_array(even_n).tolist():
+            if twins.is_upper(p) or twins.is_upper(even_n - p):
                 count += 1
         return count
 
+    @_memoized
     def count_pairs_with_lower_twin_prime(self, even_n):
         """
         For a given even number, return the count of Goldbach pairs (p, q) where either p or q is a lower twin prime (i.e., p and p+2 are prime, or q and q+2 are prime).
         """
-        self.ensure_sieve(even_n)
-        pairs = self.get(even_n)
+        counter = self._counter_for(even_n)
+        if counter is not None:
+            return counter.count(even_n // 2, "lower")
+        twins = self._twin_tables(even_n)
         count = 0
-        for p, q in pairs:
-            if (p + 2 in self.primes_set) or (q + 2 in self.primes_set):
+        for p in self.get_array(even_n).tolist():
+            if twins.is_lower(p) or twins.is_lower(even_n - p):
                 count += 1
         return count
 
@@ -169,13 +1143,27 @@ class GoldbachPairs:
         """
         return self.count_pairs_with_upper_twin_prime(even_n) == 0
 
-    def get_critical_even_numbers(self, start, end):
+    def get_critical_even_numbers(
+        self, start, end, checkpoint=None, chunk_size=CHECKPOINT_CHUNK, progress=None
+    ):
         """
         Return a list of critical even numbers in the range [start, end].
         Critical numbers have no upper twin primes in any of their Goldbach pairs.
+
+        With a checkpoint path the range is searched chunk by chunk and can be
+        resumed after an interruption (see _resumable_search).
         """
+        if checkpoint is not None:
+            return self._resumable_search(
+                "critical", start, end, checkpoint, chunk_size, progress
+            )
+        self.reserve(end)
+        start += start % 2  # ensure even numbers only
+        if (end - start) // 2 >= RANGE_SCAN_THRESHOLD:
+            counts = self.upper_twin_pair_counts(start, end)
+            return [start + 2 * i for i, count in enumerate(counts) if count == 0]
         critical_numbers = []
-        for n in range(start + (start % 2), end + 1, 2):  # ensure even numbers only
+        for n in range(start, end + 1, 2):
             if self.is_critical_even_number(n):
                 critical_numbers.append(n)
         return critical_numbers
@@ -184,79 +1172,120 @@ class GoldbachPairs:
         """
         Analyze the density of critical even numbers across subranges.
         Returns a list of tuples: (subrange_start, subrange_end, critical_count, total_evens_in_subrange)
-        """
-        results = []
-        current_start = start
 
-        while current_start <= end:
-            current_end = min(current_start + subrange_size - 1, end)
-            if current_end % 2 == 1:  # ensure even end
-                current_end -= 1
-
-            critical_numbers = self.get_critical_even_numbers(
-                current_start, current_end
-            )
-            total_evens = len(
-                range(current_start + (current_start % 2), current_end + 1, 2)
-            )
+        The critical numbers of [start, end] are found once and turned into a
+        prefix-count table, so every subrange is a difference of two entries
+        and binning the same range again with another subrange_size is free.
+        """
+        if subrange_size < 1:
+            raise ValueError("subrange_size must be >= 1")
+        if start > end:
+            return []
+        first, prefix = self._critical_prefix_counts(start, end)
 
-            results.append(
-                (current_start, current_end, len(critical_numbers), total_evens)
+        # Subrange k covers the even numbers of [s_k, e_k], i.e. the critical
+        # flags with indices [lo_k, hi_k) counted from first
+        if np is not None:
+            starts = np.arange(start, end + 1, subrange_size, dtype=np.int64)
+            ends = np.minimum(starts + subrange_size - 1, end)
+            ends -= ends & 1  # ensure even end
+            lo = (starts + (starts & 1) - first) // 2
+            hi = np.maximum((ends - first) // 2 + 1, lo)
+            counts = prefix[hi] - prefix[lo]
+            return list(
+                zip(starts.tolist(), ends.tolist(), counts.tolist(), (hi - lo).tolist())
             )
-            current_start += subrange_size
 
+        results = []
+        for current_start in range(start, end + 1, subrange_size):
+            current_end = min(current_start + subrange_size - 1, end)
+            current_end -= current_end & 1  # ensure even end
+            lo = (current_start + (current_start & 1) - first) // 2
+            hi = max((current_end - first) // 2 + 1, lo)
+            results.append((current_start, current_end, prefix[hi] - prefix[lo], hi - lo))
         return results
 
+    def _critical_prefix_counts(self, start, end):
+        """
+        Return (first, prefix) where prefix[k] is the number of critical even
+        numbers among first, first + 2, ..., first + 2 * (k - 1), and the
+        covered evens include [start, end]. The last table is kept, so
+        re-binning the same range with another subrange size reuses it.
+        """
+        start += start % 2
+        cached = self._critical_prefix
+        if cached is not None and cached[0] <= start and end <= cached[0] + 2 * (len(cached[1]) - 2):
+            return cached
+        size = max((end - start) // 2 + 1, 0)
+        if np is not None:
+            flags = np.zeros(size, dtype=np.int64)
+            flags[(np.array(self.get_critical_even_numbers(start, end), dtype=np.int64) - start) // 2] = 1
+            prefix = np.zeros(size + 1, dtype=np.int64)
+            np.cumsum(flags, out=prefix[1:])
+        else:
+            flags = bytearray(size)
+            for n in self.get_critical_even_numbers(start, end):
+                flags[(n - start) // 2] = 1
+            prefix = array("q", accumulate(flags, initial=0))
+        self._critical_prefix = (start, prefix)
+        return self._critical_prefix
+
     def get_twin_primes_set(self, limit):
         """
         Return the set of all primes that are part of twin prime pairs up to the limit.
         A prime p is in this set if either (p, p+2) or (p-2, p) are both prime.
         """
-        self.ensure_sieve(limit)
-        twin_primes = set()
-
-        for p in self.primes:
-            if p > limit:
-                break
-            # Check if p is part of a twin prime pair
-            if (p + 2 in self.primes_set) or (p - 2 in self.primes_set):
-                twin_primes.add(p)
-
-        return twin_primes
+        return set(self._twin_tables(limit).primes_upto(limit))
 
+    @_memoized
     def count_twin_prime_goldbach_pairs(self, even_n):
         """
         For a given even number, return the count of Goldbach pairs (p, q) where both p and q
         are from the set of twin primes. Twin primes can be used twice (e.g., 5+5=10).
         """
-        self.ensure_sieve(even_n)
-        twin_primes = self.get_twin_primes_set(even_n)
+        counter = self._counter_for(even_n)
+        if counter is not None:
+            return counter.count(even_n // 2, "twin", both=True)
+        twins = self._twin_tables(even_n)
 
         count = 0
-        for p in twin_primes:
-            q = even_n - p
-            if (
-                q >= p and q in twin_primes
-            ):  # p <= q to avoid double counting, both must be twin primes
+        for p in twins.primes_upto(even_n // 2):
+            if twins.is_twin(even_n - p):  # p <= q to avoid double counting
                 count += 1
 
         return count
 
+    @_memoized
     def count_pairs_with_any_twin_prime(self, even_n):
         """
         For a given even number, return the count of Goldbach pairs (p, q) where either p or q
         is any twin prime (either upper or lower twin prime).
         """
-        self.ensure_sieve(even_n)
-        pairs = self.get(even_n)
-        twin_primes = self.get_twin_primes_set(even_n)
+        counter = self._counter_for(even_n)
+        if counter is not None:
+            return counter.count(even_n // 2, "twin")
+        twins = self._twin_tables(even_n)
 
         count = 0
-        for p, q in pairs:
-            if p in twin_primes or q in twin_primes:
+        for p in self.get_array(even_n).tolist():
+            if twins.is_twin(p) or twins.is_twin(even_n - p):
                 count += 1
         return count
 
+    def _twin_tables(self, upto):
+        """
+        Return the cached TwinTables, extended just far enough to cover upto.
+        Only the bytes added since the last call are derived.
+        """
+        if self._twins.max_n < upto:
+            with self._write_lock:
+                if self._twins.max_n < upto:
+                    self.ensure_sieve(upto + 32)  # the tables trail the sieve by one byte
+                    twins = self._twins.copy() if self.thread_safe else self._twins
+                    twins.extend(self._flags, upto)
+                    self._twins = twins
+        return self._twins
+
     def is_isolated_goldbach_number(self, even_n):
         """
         Return True if the even number has NO twin primes (neither upper nor lower) in any of its Goldbach pairs.
@@ -268,16 +1297,90 @@ class GoldbachPairs:
         """
         return self.count_pairs_with_any_twin_prime(even_n) == 0
 
-    def get_isolated_goldbach_numbers(self, start, end):
+    def get_isolated_goldbach_numbers(
+        self, start, end, checkpoint=None, chunk_size=CHECKPOINT_CHUNK, progress=None
+    ):
         """
         Return a list of isolated Goldbach numbers in the range [start, end].
         Isolated numbers have no twin primes in any of their Goldbach pairs.
 
         Note: This method typically returns an empty list in practical ranges,
         demonstrating the remarkable density of twin primes.
+
+        With a checkpoint path the range is searched chunk by chunk and can be
+        resumed after an interruption (see _resumable_search).
         """
+        if checkpoint is not None:
+            return self._resumable_search(
+                "isolated", start, end, checkpoint, chunk_size, progress
+            )
+        self.reserve(end)
+        start += start % 2  # ensure even numbers only
+        if (end - start) // 2 >= RANGE_SCAN_THRESHOLD:
+            counts = self.any_twin_pair_counts(start, end)
+            return [start + 2 * i for i, count in enumerate(counts) if count == 0]
         isolated_numbers = []
-        for n in range(start + (start % 2), end + 1, 2):  # ensure even numbers only
+        for n in range(start, end + 1, 2):
             if self.is_isolated_goldbach_number(n):
                 isolated_numbers.append(n)
         return isolated_numbers
+
+    def _first_twin_pair(self, even_n):
+        """
+        Return the first Goldbach pair (p, q) of even_n in which p or q is a
+        twin prime, or None if there is none. The sieve must cover even_n + 2.
+
+        Small primes are nearly all twins, so the scan usually stops at the
+        first pair; only the primes up to EARLY_EXIT_PRIMES are kept decoded,
+        larger candidates are walked segment by segment if ever needed. This
+        only pays off for the isolated search: about a quarter of all evens
+        are critical and would walk every pair, so critical numbers are
+        counted on the bitsets instead.
+        """
+        is_prime = self._is_prime
+        half = even_n // 2
+        bound = min(half, EARLY_EXIT_PRIMES)
+        small = self._primes_upto(bound)
+        candidates = chain(
+            islice(small, bisect_right(small, bound)),
+            self.iter_primes(bound + 1, half + 1),
+        )
+        for p in candidates:
+            q = even_n - p
+            if not is_prime(q):
+                continue
+            if is_prime(p - 2) or is_prime(q - 2) or is_prime(p + 2) or is_prime(q + 2):
+                return (p, q)
+        return None
+
+    def _resumable_search(self, search, start, end, checkpoint, chunk_size, progress):
+        """
+        Search [start, end] for "critical" or "isolated" even numbers chunk by
+        chunk: critical n are counted on the pair bitsets, isolated n stop at
+        their first twin-prime pair.
+
+        After every chunk of about chunk_size integers its hits are appended
+        to the checkpoint's hit log and the last checked n is recorded (see
+        goldbach.checkpoint), and progress (if given) is called with that n
+        and the hits so far. If the file already holds
+        a checkpoint of the same search and start, the search resumes after
+        its last n. Combined with a sieve snapshot, neither the sieve nor the
+        search has to be redone after a restart. With workers > 1 every chunk
+        is spread over a process pool by map_range.
+        """
+        start += start % 2
+        last_n, hits = load_checkpoint(checkpoint, search, start)
+        n = start if last_n is None else last_n + 2
+        while n <= end:
+            chunk_end = max(n, min(n + chunk_size - 1, end))
+            chunk_end -= chunk_end & 1
+            self.reserve(chunk_end + 2)
+            self.prefetch(min(chunk_end + chunk_size, end) + 2)
+            flags = self.map_range(search, n, chunk_end)
+            new_hits = [n + 2 * i for i, flag in enumerate(flags.tolist()) if flag]
+            hits.extend(new_hits)
+            save_checkpoint(checkpoint, search, start, chunk_end, new_hits, len(hits))
+            if progress is not None:
+                progress(chunk_end, hits)
+            n = chunk_end + 2
+        return [m for m in hits if m <= end]
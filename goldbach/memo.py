@@ -0,0 +1,89 @@
+"""
+Bounded LRU memo for per-n results.
+
+Entries live in an OrderedDict in least-recently-used order and are evicted
+from the front once the entry or byte bound is exceeded. Per-n results do
+not depend on how far the sieve extends, so entries stay valid while it
+grows.
+"""
+
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from copy import copy
+
+MemoInfo = namedtuple("MemoInfo", "hits misses maxsize maxbytes currsize currbytes")
+
+
+def _sizeof(value):
+    """Approximate memory held by a cached value, counting list and tuple items."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class LRUMemo:
+    """
+    LRU cache bounded by number of entries (maxsize) and/or by approximate
+    bytes (maxbytes); None leaves a bound off. Values are handed out as
+    shallow copies so callers cannot modify what is cached. The entries are
+    guarded by a lock, so one memo can serve several threads; values are
+    computed outside of it.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=None):
+        if maxsize is None and maxbytes is None:
+            raise ValueError("LRUMemo needs maxsize or maxbytes")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key, compute):
+        """Return the value cached under key, calling compute() to fill it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return copy(entry[0])
+            self.misses += 1
+        value = compute()
+        size = _sizeof(value)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                self._evict()
+        return copy(value)
+
+    def _evict(self):
+        entries = self._entries
+        while entries and (
+            (self.maxsize is not None and len(entries) > self.maxsize)
+            or (self.maxbytes is not None and self._bytes > self.maxbytes)
+        ):
+            _, (_, size) = entries.popitem(last=False)
+            self._bytes -= size
+
+    def clear(self):
+        """Drop every entry; the hit and miss counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        """Return hit/miss counters, bounds and current usage as a MemoInfo."""
+        with self._lock:
+            return MemoInfo(
+                self.hits,
+                self.misses,
+                self.maxsize,
+                self.maxbytes,
+                len(self._entries),
+                self._bytes,
+            )
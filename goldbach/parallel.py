@@ -0,0 +1,59 @@
+"""
+Multi-process segmented sieve.
+
+The wheel bytes of [lo, hi) are split into segments that a process pool
+sieves independently with the shared base primes. Each worker writes its
+segment straight into one shared memory block, so no prime lists or flag
+buffers are pickled back to the parent.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .wheel import sieve_segment
+
+_base_primes = None
+
+
+def _init_worker(base_primes):
+    global _base_primes
+    _base_primes = base_primes
+
+
+def _sieve_into(shm_name, offset, lo, hi):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        shm.buf[lo - offset : hi - offset] = sieve_segment(_base_primes, lo, hi)
+    finally:
+        shm.close()
+
+
+def parallel_sieve_chunks(base_primes, lo, hi, workers, segment_size):
+    """
+    Sieve wheel bytes [lo, hi) across `workers` processes.
+
+    Yields the packed bytes as a single memoryview into shared memory. The
+    view is only valid until the generator is resumed, so callers must copy
+    or write it out before asking for the next item.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=hi - lo)
+    try:
+        segments = [(s, min(s + segment_size, hi)) for s in range(lo, hi, segment_size)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(base_primes,),
+        ) as pool:
+            futures = [
+                pool.submit(_sieve_into, shm.name, lo, s, e) for s, e in segments
+            ]
+            for future in futures:
+                future.result()
+        view = shm.buf[: hi - lo]
+        try:
+            yield view
+        finally:
+            view.release()
+    finally:
+        shm.close()
+        shm.unlink()
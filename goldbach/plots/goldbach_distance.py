@@ -23,8 +23,9 @@ def plot_goldbach_distance(goldbach_pairs, start=3, end=50, output=None):
     xs = []
     ys = []
 
-    for n in range(start, end + 1):
-        distance = goldbach_pairs.goldbach_distance(n)
+    for n, distance in zip(
+        range(start, end + 1), goldbach_pairs.goldbach_distances(start, end).tolist()
+    ):
         if distance >= 0:  # Only include valid distances (not -1)
             xs.append(n)
             ys.append(distance)
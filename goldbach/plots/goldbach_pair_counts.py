@@ -12,8 +12,8 @@ def plot_goldbach_pair_counts(goldbach_pairs, start=4, end=100, output=None):
     Plot the number of Goldbach pairs for each even number in [start, end].
     """
 
-    evens = list(range(start, end + 1, 2))
-    counts = [len(goldbach_pairs.get(n)) for n in evens]
+    evens = list(range(start + start % 2, end + 1, 2))
+    counts = goldbach_pairs.metric("pair_count", start, end)
     marker_size = get_marker_size(len(evens))
     plt.figure(figsize=(12, 6))
     plt.plot(
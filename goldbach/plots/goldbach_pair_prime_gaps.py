@@ -25,24 +25,23 @@ def plot_goldbach_pair_prime_gaps(
 
     xs = []
     ys = []
-    for even_n in range(start, end + 1, 2):
-        if gap_mode == "all":
+    if gap_mode == "all":
+        for even_n in range(start, end + 1, 2):
             gaps = goldbach_pairs.prime_gaps(even_n)
             for gap in gaps:
                 xs.append(even_n)
                 ys.append(gap)
-        elif gap_mode == "smallest":
-            gap = goldbach_pairs.smallest_prime_gap(even_n)
-            if gap is not None:
-                xs.append(even_n)
-                ys.append(gap)
-        elif gap_mode == "largest":
-            gap = goldbach_pairs.largest_prime_gap(even_n)
-            if gap is not None:
+    elif gap_mode in ("smallest", "largest"):
+        if start % 2 != 0 or start < 4:
+            raise ValueError("Input must be an even number >= 4")
+        metric = "min_gap" if gap_mode == "smallest" else "max_gap"
+        gaps = goldbach_pairs.metric(metric, start, end).tolist()
+        for even_n, gap in zip(range(start, end + 1, 2), gaps):
+            if gap >= 0:
                 xs.append(even_n)
                 ys.append(gap)
-        else:
-            raise ValueError("gap_mode must be 'all', 'smallest', or 'largest'")
+    else:
+        raise ValueError("gap_mode must be 'all', 'smallest', or 'largest'")
 
     evens = list(range(start, end + 1, 2))
     marker_size = get_marker_size(len(evens))
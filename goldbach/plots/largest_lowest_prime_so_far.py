@@ -15,13 +15,13 @@ def plot_largest_lowest_prime_so_far(goldbach_pairs, start=4, end=100, output=No
     xs_small = []
     ys_max_so_far = []
     max_prime = None
-    for even_n in range(start, end + 1, 2):
-        pairs = goldbach_pairs.get(even_n)
-        if pairs:
+    lowest = goldbach_pairs.metric("lowest_prime", start, end).tolist()
+    for even_n, p in zip(range(start + start % 2, end + 1, 2), lowest):
+        if p >= 0:
             xs_small.append(even_n)
 
-            if max_prime is None or pairs[0][0] > max_prime:
-                max_prime = pairs[0][0]
+            if max_prime is None or p > max_prime:
+                max_prime = p
             ys_max_so_far.append(max_prime)
 
     n_points = len(xs_small)
@@ -9,8 +9,8 @@ def plot_lower_twin_primes_count(goldbach_pairs, start=4, end=100, output=None):
     """
     For each even number in [start, end], plot the number of Goldbach pairs whose lower prime is a lower twin prime.
     """
-    evens = list(range(start, end + 1, 2))
-    counts = [goldbach_pairs.count_pairs_with_lower_twin_prime(n) for n in evens]
+    evens = list(range(start + start % 2, end + 1, 2))
+    counts = goldbach_pairs.metric("lower_twin_pairs", start, end).tolist()
     plt.figure(figsize=(12, 6))
     plt.bar(evens, counts, color="teal")
     # Only label even numbers for orientation
@@ -14,11 +14,11 @@ def plot_lowest_primes(goldbach_pairs, start=4, end=100, output=None):
 
     xs_small = []
     ys_small = []
-    for even_n in range(start, end + 1, 2):
-        pairs = goldbach_pairs.get(even_n)
-        if pairs:
+    lowest = goldbach_pairs.metric("lowest_prime", start, end).tolist()
+    for even_n, p in zip(range(start + start % 2, end + 1, 2), lowest):
+        if p >= 0:
             xs_small.append(even_n)
-            ys_small.append(pairs[0][0])
+            ys_small.append(p)
 
     n_points = len(xs_small)
     marker_size = get_marker_size(n_points) ** 2
@@ -4,7 +4,6 @@ Plot mean and median |p-n| for Goldbach decompositions.
 
 from .utils import get_marker_size
 import matplotlib.pyplot as plt
-import numpy as np
 
 
 def plot_mean_median_distances(
@@ -15,17 +14,15 @@ def plot_mean_median_distances(
     If normalize is True, plot mean and median divided by n (the center).
     """
     
-    evens = list(range(start, end + 1, 2))
+    evens = list(range(start + start % 2, end + 1, 2))
     means = []
     medians = []
-    for even_n in evens:
-        dists = goldbach_pairs.prime_gaps(even_n)
-        n = even_n // 2
-        if normalize and dists:
-            dists = [d / n for d in dists]
-        if dists:
-            means.append(np.mean(dists))
-            medians.append(np.median(dists))
+    for record in goldbach_pairs.metrics_range(start, end):
+        n = record.n // 2
+        if record.pair_count:
+            scale = n if normalize else 1
+            means.append(record.mean_gap / scale)
+            medians.append(record.median_gap / scale)
         else:
             means.append(0)
             medians.append(0)
@@ -15,12 +15,9 @@ def plot_prime_frequencies(goldbach_pairs, start=4, end=100, top_n=30, output=No
 
     prime_counter = Counter()
     for even_n in range(start, end + 1, 2):
-        gpairs = goldbach_pairs.get(even_n)
-        for p, q in gpairs:
-            if p <= end:
-                prime_counter[p] += 1
-            if q <= end:
-                prime_counter[q] += 1
+        lower = goldbach_pairs.get_array(even_n).tolist()
+        prime_counter.update(p for p in lower if p <= end)
+        prime_counter.update(even_n - p for p in lower if even_n - p <= end)
     # Only keep primes <= end
     filtered = [(prime, freq) for prime, freq in prime_counter.items() if prime <= end]
     filtered.sort(key=lambda x: x[1], reverse=True)
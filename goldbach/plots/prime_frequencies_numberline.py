@@ -24,10 +24,9 @@ def plot_prime_frequencies_numberline(
 
     prime_counter = Counter()
     for even_n in range(start, end + 1, 2):
-        decomps = goldbach_pairs.get(even_n)
-        for p, q in decomps:
-            prime_counter[p] += 1
-            prime_counter[q] += 1
+        lower = goldbach_pairs.get_array(even_n).tolist()
+        prime_counter.update(lower)
+        prime_counter.update(even_n - p for p in lower)
     primes, freqs = zip(*sorted(prime_counter.items())) if prime_counter else ([], [])
     plt.figure(figsize=(12, 6))
     bars = plt.bar(primes, freqs, color="purple")
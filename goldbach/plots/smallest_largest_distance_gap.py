@@ -12,11 +12,12 @@ def plot_smallest_largest_distance_gap(goldbach_pairs, start=4, end=100, output=
     """
     xs = []
     ys = []
-    for even_n in range(start, end + 1, 2):
-        decomps = goldbach_pairs.get(even_n)
-        if decomps:
+    lowest = goldbach_pairs.metric("lowest_prime", start, end).tolist()
+    min_gaps = goldbach_pairs.metric("min_gap", start, end).tolist()
+    for even_n, p, gap in zip(range(start + start % 2, end + 1, 2), lowest, min_gaps):
+        if p >= 0:
             xs.append(even_n)
-            ys.append(decomps[-1][1] - decomps[0][0])
+            ys.append((even_n + gap) // 2 - p)
     plt.figure(figsize=(10, 5))
     plt.plot(xs, ys, marker="o", linestyle="", color="green")
     plt.xlabel("Even Number")
@@ -15,13 +15,15 @@ def plot_smallest_largest_primes(goldbach_pairs, start=4, end=100, output=None):
     ys_small = []
     xs_large = []
     ys_large = []
-    for even_n in range(start, end + 1, 2):
-        decomps = goldbach_pairs.get(even_n)
-        if decomps:
+    lowest = goldbach_pairs.metric("lowest_prime", start, end).tolist()
+    min_gaps = goldbach_pairs.metric("min_gap", start, end).tolist()
+    for even_n, p, gap in zip(range(start + start % 2, end + 1, 2), lowest, min_gaps):
+        if p >= 0:
             xs_small.append(even_n)
-            ys_small.append(decomps[0][0])
+            ys_small.append(p)
             xs_large.append(even_n)
-            ys_large.append(decomps[-1][1])
+            # The largest lower prime leaves the smallest gap: q = (n + gap) / 2
+            ys_large.append((even_n + gap) // 2)
     n_points = len(xs_small)
     marker_size = get_marker_size(n_points)
     plt.figure(figsize=(12, 6))
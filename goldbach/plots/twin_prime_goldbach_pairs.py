@@ -11,8 +11,8 @@ def plot_twin_prime_goldbach_pairs(goldbach_pairs, start=4, end=100, output=None
     For each even number in [start, end], plot the number of Goldbach pairs where both primes
     are from the set of twin primes.
     """
-    evens = list(range(start, end + 1, 2))
-    counts = [goldbach_pairs.count_twin_prime_goldbach_pairs(n) for n in evens]
+    evens = list(range(start + start % 2, end + 1, 2))
+    counts = goldbach_pairs.metric("twin_prime_pairs", start, end).tolist()
 
     plt.figure(figsize=(12, 6))
     plt.bar(evens, counts, color="darkorange", alpha=0.7)
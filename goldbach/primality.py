@@ -0,0 +1,39 @@
+"""
+Primality test for numbers beyond the sieve.
+
+Small factors are ruled out in one step with a gcd against the product of
+the primes below 1000; survivors go through Miller-Rabin with the first
+thirteen prime bases (up to 41), which is deterministic for every
+n < 3.3 * 10**24 and in particular for all 64-bit integers.
+"""
+
+from math import gcd, prod
+
+SMALL_PRIMES = tuple(
+    p for p in range(2, 1000) if all(p % d for d in range(2, int(p**0.5) + 1))
+)
+_SMALL_PRIMES_SET = frozenset(SMALL_PRIMES)
+_SMALL_PRIMORIAL = prod(SMALL_PRIMES)
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def miller_rabin(n):
+    """Return True if n is prime."""
+    if n < 1000:
+        return n in _SMALL_PRIMES_SET
+    if gcd(n, _SMALL_PRIMORIAL) != 1:
+        return False
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
@@ -3,9 +3,9 @@ def print_goldbach_pair_counts(goldbach_pairs, start, end):
         start += 1
     if end % 2 != 0:
         end -= 1
-    for n in range(start, end + 1, 2):
-        pairs = goldbach_pairs.get(n)
-        print(f"{n}: {len(pairs)}")
+    counts = goldbach_pairs.metric("pair_count", start, end)
+    for n, count in zip(range(start, end + 1, 2), counts):
+        print(f"{n}: {count}")
 
 
 def print_goldbach_pair_list(goldbach_pairs, start, end):
@@ -0,0 +1,89 @@
+"""
+On-disk snapshots of the packed wheel table.
+
+A snapshot file is a small header followed by the raw wheel bytes (see
+goldbach.wheel). Files are opened read-only through mmap, so every process
+working on the same snapshot shares its pages via the OS page cache. Files
+only ever grow by appending bytes, which keeps existing mappings valid
+while another process extends the table.
+"""
+
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+MAGIC = b"GBWHEEL\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sII")
+HEADER_SIZE = _HEADER.size
+
+
+def _check_header(header, path):
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} is not a Goldbach sieve snapshot")
+    magic, version, _ = _HEADER.unpack(header[:HEADER_SIZE])
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a Goldbach sieve snapshot")
+    if version != VERSION:
+        raise ValueError(
+            f"{path} has snapshot version {version}, expected {VERSION}"
+        )
+
+
+def open_snapshot(path):
+    """
+    Map a snapshot read-only and return its wheel bytes as a memoryview.
+    Returns an empty bytearray if the file does not exist yet or is still
+    shorter than its header (locked_snapshot creates it before writing one).
+    """
+    if not os.path.exists(path):
+        return bytearray()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+            return bytearray()
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _check_header(mapped, path)
+    return memoryview(mapped)[HEADER_SIZE:]
+
+
+def save_snapshot(path, flags):
+    """Write the wheel bytes to path, replacing any existing snapshot atomically."""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0))
+        f.write(flags)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def locked_snapshot(path):
+    """
+    Open (or create) a snapshot for appending under an exclusive lock.
+
+    Yields the open file and the number of wheel bytes it currently holds,
+    which may exceed what the caller has mapped if another process has
+    extended it in the meantime.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "r+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            header = f.read(HEADER_SIZE)
+            if not header:
+                f.write(_HEADER.pack(MAGIC, VERSION, 0))
+                f.flush()
+            else:
+                _check_header(header, path)
+            size = f.seek(0, os.SEEK_END) - HEADER_SIZE
+            yield f, size
+            f.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,154 @@
+"""
+Columnar on-disk store of per-n metrics.
+
+Row i of every column holds the metric of the even number n = 2i. Each
+column is a raw little-endian int64 file (<name>.i64) in the store
+directory, read through a read-only mmap, so a sub-range is a slice of the
+mapping rather than a recomputation. Each column grows on its own, only
+when it is asked for, by appending the rows of a newly computed range; a
+column covers the whole rows in its file, so an append cut short by a crash
+is simply redone from there. Appends hold an exclusive lock on the column
+file, so several processes can share one store.
+"""
+
+import mmap
+import os
+import sys
+import threading
+from array import array
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:  # columns are returned as typed arrays
+    np = None
+
+# Metric name -> GoldbachPairs range method computing it for the evens of [start, end]
+METRICS = {
+    "pair_count": "pair_counts",
+    "min_gap": "smallest_prime_gaps",
+    "max_gap": "largest_prime_gaps",
+    "lowest_prime": "lowest_primes",
+    "upper_twin_pairs": "upper_twin_pair_counts",
+    "lower_twin_pairs": "lower_twin_pair_counts",
+    "any_twin_pairs": "any_twin_pair_counts",
+    "twin_prime_pairs": "twin_prime_goldbach_pair_counts",
+    "goldbach_distance": None,  # goldbach_distances restricted to even n
+}
+
+_ITEMSIZE = 8
+_SWAP = sys.byteorder != "little"
+
+
+def compute_metric(goldbach_pairs, name, start, end):
+    """Compute the metric name for every even n in [start, end] without a store."""
+    if name not in METRICS:
+        raise ValueError(f"unknown metric {name!r}, expected one of {sorted(METRICS)}")
+    method = METRICS[name]
+    if method is not None:
+        return getattr(goldbach_pairs, method)(start, end)
+    start += start % 2
+    end -= end % 2
+    low = max(start, 2)
+    distances = goldbach_pairs.goldbach_distances(low, end) if end >= low else []
+    head = (low - start) // 2  # 0 has no distance
+    if np is not None:
+        return np.concatenate(
+            [np.full(head, -1, dtype=np.int64), np.asarray(distances, dtype=np.int64)[::2]]
+        )
+    values = array("q", [-1]) * head
+    values.extend(distances[::2])
+    return values
+
+
+class MetricsStore:
+    """Persistent int64 columns of the metrics in METRICS, keyed by n / 2."""
+
+    def __init__(self, directory, goldbach_pairs):
+        self.directory = directory
+        self.goldbach_pairs = goldbach_pairs
+        os.makedirs(directory, exist_ok=True)
+        self._maps = {}
+        self._lock = threading.Lock()  # one appending thread at a time
+        # Rows held by each column; a partly written trailing row is dropped
+        self.rows = {name: self._stored_rows(name) for name in METRICS}
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.i64")
+
+    def _stored_rows(self, name):
+        path = self._path(name)
+        return os.path.getsize(path) // _ITEMSIZE if os.path.exists(path) else 0
+
+    def ensure(self, name, end):
+        """Compute and append the rows of column name up to the even number end."""
+        rows = end // 2 + 1
+        if rows <= self.rows[name]:
+            return
+        with self._lock:
+            if rows > self.rows[name]:
+                self._append(name, rows)
+
+    def _append(self, name, rows):
+        fd = os.open(self._path(name), os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                # Another process may have appended since self.rows was read
+                stored = os.fstat(f.fileno()).st_size // _ITEMSIZE
+                if rows > stored:
+                    values = compute_metric(
+                        self.goldbach_pairs, name, 2 * stored, 2 * (rows - 1)
+                    )
+                    f.truncate(stored * _ITEMSIZE)
+                    f.seek(0, os.SEEK_END)
+                    f.write(self._to_bytes(values))
+                    f.flush()
+                    stored = rows
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        self._maps.pop(name, None)
+        self.rows[name] = stored
+
+    @staticmethod
+    def _to_bytes(values):
+        if np is not None:
+            return np.asarray(values, dtype="<i8").tobytes()
+        values = array("q", values)
+        if _SWAP:
+            values.byteswap()
+        return values.tobytes()
+
+    def column(self, name, start, end):
+        """
+        Return the metric name for every even n in [start, end], computing
+        missing rows first. With NumPy the result is a read-only view of the
+        mapped file; otherwise an array('q') copied out of it.
+        """
+        if name not in METRICS:
+            raise ValueError(f"unknown metric {name!r}, expected one of {sorted(METRICS)}")
+        start += start % 2
+        end -= end % 2
+        if end < start:
+            return np.zeros(0, dtype=np.int64) if np is not None else array("q")
+        self.ensure(name, end)
+        maps = self._maps
+        mapped = maps.get(name)
+        if mapped is None or len(mapped) < (end // 2 + 1) * _ITEMSIZE:
+            with open(self._path(name), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            maps[name] = mapped
+        lo, hi = start // 2, end // 2 + 1
+        if np is not None:
+            return np.frombuffer(mapped, dtype="<i8", count=hi - lo, offset=lo * _ITEMSIZE)
+        values = array("q")
+        values.frombytes(mapped[lo * _ITEMSIZE : hi * _ITEMSIZE])
+        if _SWAP:
+            values.byteswap()
+        return values
@@ -0,0 +1,67 @@
+"""
+Streaming top-K selection of Goldbach distances with ties.
+
+The K largest distance values seen so far live in a min-heap; its root is
+the current threshold. Only (n, distance) entries at or above the threshold
+are kept, and they are pruned whenever the list has doubled, so memory stays
+O(K + ties) however wide the scanned range is. Because the threshold only
+rises, every entry that ends up in the result was kept when it arrived.
+"""
+
+import heapq
+
+
+class TopDistances:
+    """
+    Collect the top_n largest Goldbach distances, including every entry that
+    ties with the top_n-th largest, as top_goldbach_distances defines it.
+    """
+
+    def __init__(self, top_n=10):
+        if top_n < 1:
+            raise ValueError("top_n must be >= 1")
+        self.top_n = top_n
+        self._heap = []
+        self._kept = []
+        self._prune_at = top_n
+
+    def push(self, n, distance):
+        """Offer a single (n, distance); negative distances are ignored."""
+        if distance < 0:
+            return
+        heap = self._heap
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, distance)
+        elif distance > heap[0]:
+            heapq.heapreplace(heap, distance)
+        elif distance < heap[0]:
+            return
+        self._kept.append((n, distance))
+        if len(self._kept) >= 2 * self._prune_at:
+            self._prune()
+
+    def update(self, start, distances):
+        """Offer a chunk of distances for n = start, start + 1, ... from any distance engine."""
+        if self._heap and len(self._heap) == self.top_n and hasattr(distances, "nonzero"):
+            # NumPy chunk: only look at entries that can still make the cut
+            for i in (distances >= self._heap[0]).nonzero()[0].tolist():
+                self.push(start + i, int(distances[i]))
+            return
+        for i, distance in enumerate(distances):
+            self.push(start + i, int(distance))
+
+    def merge(self, other):
+        """Fold in the partial result of another TopDistances, e.g. from a parallel chunk."""
+        for n, distance in other._kept:
+            self.push(n, distance)
+
+    def _prune(self):
+        if len(self._heap) == self.top_n:
+            threshold = self._heap[0]
+            self._kept = [entry for entry in self._kept if entry[1] >= threshold]
+        self._prune_at = max(self.top_n, len(self._kept))
+
+    def result(self):
+        """Return the (n, distance) list sorted by distance descending, then n ascending."""
+        self._prune()
+        return sorted(self._kept, key=lambda x: (-x[1], x[0]))
@@ -0,0 +1,114 @@
+"""
+Twin-prime flag tables in the mod-30 wheel layout.
+
+On the wheel, twin pairs can only sit on the residues (11, 13), (17, 19)
+and (29, 31), the last one straddling two bytes. The upper-twin table has
+the bit of p set when p - 2 is prime as well, the lower-twin table when
+p + 2 is. Both are derived from the prime table with byte translations
+and one big-int AND per extension, and are extended as the sieve grows.
+The twins 3, 5 and the upper twin 7 involve primes off the wheel and are
+special-cased.
+"""
+
+from array import array
+from bisect import bisect_right
+
+from .bitset import and_bytes, or_bytes
+from .wheel import WHEEL_MASK, segment_primes
+
+
+def _table(fn):
+    return bytes(fn(b) for b in range(256))
+
+
+def _bit(b, j):
+    return (b >> j) & 1
+
+
+# Residue bits: 1 -> 0, 7 -> 1, 11 -> 2, 13 -> 3, 17 -> 4, 19 -> 5, 23 -> 6, 29 -> 7
+_LOWER_WITHIN = _table(lambda b: (_bit(b, 2) & _bit(b, 3)) << 2 | (_bit(b, 4) & _bit(b, 5)) << 4)
+_UPPER_WITHIN = _table(lambda b: (_bit(b, 2) & _bit(b, 3)) << 3 | (_bit(b, 4) & _bit(b, 5)) << 5)
+_KEEP_29 = _table(lambda b: b & 0x80)
+_KEEP_1 = _table(lambda b: b & 0x01)
+_1_TO_29 = _table(lambda b: _bit(b, 0) << 7)
+_29_TO_1 = _table(lambda b: _bit(b, 7))
+
+
+class TwinTables:
+    """Upper-twin and lower-twin wheel tables plus the sorted array of all twin primes."""
+
+    def __init__(self):
+        self.upper = bytearray()
+        self.lower = bytearray()
+        self.primes = array("I")
+
+    def extend(self, flags, upto=None):
+        """
+        Catch up with a grown prime table, or only far enough to cover upto.
+        The last byte is left out because the lower twin on residue 29 needs
+        the first bit of the following byte.
+        """
+        lo = len(self.upper)
+        hi = len(flags) - 1
+        if upto is not None:
+            hi = min(hi, upto // 30 + 1)
+        if hi <= lo:
+            return
+        segment = bytes(flags[lo:hi])
+        following = bytes(flags[lo + 1 : hi + 1])
+        preceding = bytes(flags[lo - 1 : hi - 1]) if lo else b"\0" + bytes(flags[: hi - 1])
+
+        lower = or_bytes(
+            segment.translate(_LOWER_WITHIN),
+            and_bytes(segment.translate(_KEEP_29), following.translate(_1_TO_29)),
+        )
+        upper = bytearray(
+            or_bytes(
+                segment.translate(_UPPER_WITHIN),
+                and_bytes(segment.translate(_KEEP_1), preceding.translate(_29_TO_1)),
+            )
+        )
+        if lo == 0:
+            upper[0] |= WHEEL_MASK[7]  # 5 and 7
+            self.primes.extend((3, 5))
+        self.lower += lower
+        self.upper += upper
+        if 30 * hi > 1 << 32 and self.primes.typecode == "I":
+            self.primes = array("Q", self.primes)
+        self.primes.extend(segment_primes(or_bytes(lower, upper), lo))
+
+    def copy(self):
+        """Return an independent copy, to be extended while readers use this one."""
+        twins = TwinTables()
+        twins.upper = bytearray(self.upper)
+        twins.lower = bytearray(self.lower)
+        twins.primes = array(self.primes.typecode, self.primes)
+        return twins
+
+    @property
+    def max_n(self):
+        """Largest number the tables cover."""
+        return 30 * len(self.upper) - 1
+
+    def is_upper(self, n):
+        """True if n and n - 2 are both prime."""
+        if n < 7:
+            return n == 5
+        return self.upper[n // 30] & WHEEL_MASK[n % 30] != 0
+
+    def is_lower(self, n):
+        """True if n and n + 2 are both prime."""
+        if n < 7:
+            return n in (3, 5)
+        return self.lower[n // 30] & WHEEL_MASK[n % 30] != 0
+
+    def is_twin(self, n):
+        """True if n belongs to a twin prime pair."""
+        if n < 7:
+            return n in (3, 5)
+        mask = WHEEL_MASK[n % 30]
+        return (self.upper[n // 30] | self.lower[n // 30]) & mask != 0
+
+    def primes_upto(self, limit):
+        """Return the sorted twin primes <= limit as an array slice."""
+        return self.primes[: bisect_right(self.primes, limit)]
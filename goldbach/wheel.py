@@ -0,0 +1,91 @@
+"""
+Mod-30 wheel packed primality table.
+
+Every integer coprime to 30 falls on one of eight residues, so a block of 30
+consecutive integers fits in a single byte: bit j of byte k stands for
+30 * k + RESIDUES[j]. The primes 2, 3 and 5 are not represented in the table.
+"""
+
+from itertools import chain, compress
+
+RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+
+# WHEEL_MASK[r] is the bit of residue r inside a byte, or 0 if r shares a factor with 30
+WHEEL_MASK = [0] * 30
+for _bit, _residue in enumerate(RESIDUES):
+    WHEEL_MASK[_residue] = 1 << _bit
+del _bit, _residue
+
+# bytes.translate tables used by the sieve kernel and the prime decoder
+_CLEAR_BIT = [bytes(b & ~(1 << j) for b in range(256)) for j in range(8)]
+_TEST_BIT = [bytes((b >> j) & 1 for b in range(256)) for j in range(8)]
+
+
+def sieve_segment(base_primes, lo, hi):
+    """
+    Return the packed flags of bytes [lo, hi), i.e. of the integers [30*lo, 30*hi).
+
+    base_primes must be sorted and contain every prime up to sqrt(30*hi).
+    Composites are cleared in the packed form: for a prime p and a cofactor
+    residue r, the multiples p*m with m = r (mod 30) all share one bit and are
+    exactly p bytes apart, so each (p, r) is a single strided slice update.
+    """
+    segment = bytearray(b"\xff") * (hi - lo)
+    if lo == 0:
+        segment[0] &= ~WHEEL_MASK[1]  # 1 is not prime
+    top = 30 * hi - 1
+    first_cofactor = 30 * lo
+    for p in base_primes:
+        if p < 7:
+            continue
+        if p * p > top:
+            break
+        m0 = max(p, -(-first_cofactor // p))
+        for r in RESIDUES:
+            m = m0 + (r - m0) % 30
+            v = p * m
+            if v > top:
+                continue
+            i = v // 30 - lo
+            bit = WHEEL_MASK[v % 30].bit_length() - 1
+            segment[i::p] = segment[i::p].translate(_CLEAR_BIT[bit])
+    return segment
+
+
+def segment_primes(segment, lo):
+    """Return the sorted list of primes flagged in a packed segment starting at byte lo."""
+    base = 30 * lo
+    end = base + 30 * len(segment)
+    return sorted(
+        chain.from_iterable(
+            compress(range(base + r, end, 30), segment.translate(_TEST_BIT[j]))
+            for j, r in enumerate(RESIDUES)
+        )
+    )
+
+
+def odd_indicator(flags):
+    """
+    Unpack a wheel table starting at byte 0 into one byte per odd number:
+    entry i is 1 if 2i + 1 is prime and 0 otherwise.
+    """
+    indicator = bytearray(15 * len(flags))
+    for j, r in enumerate(RESIDUES):
+        # 30k + r is the odd number with index 15k + (r - 1) / 2
+        indicator[(r - 1) // 2 :: 15] = flags.translate(_TEST_BIT[j])
+    if indicator:
+        indicator[1] = indicator[2] = 1  # 3 and 5 are not on the wheel
+    return indicator
+
+
+def unpack(segment, lo):
+    """
+    Unpack a packed segment starting at byte lo into one byte per integer of
+    [30*lo, 30*(lo + len(segment))): 1 if prime and 0 otherwise.
+    """
+    flags = bytearray(30 * len(segment))
+    for j, r in enumerate(RESIDUES):
+        flags[r::30] = segment.translate(_TEST_BIT[j])
+    if lo == 0 and flags:
+        flags[2] = flags[3] = flags[5] = 1  # not on the wheel
+    return flags